@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import atexit
 import os
+import shutil
 import tempfile
 import uuid
 from datetime import datetime
@@ -18,10 +19,14 @@ from .models import CommandResult, ConversationContext, MachineConfig, UserInten
 class AIAgent:
     """High level interface used by the tests and web application."""
 
+    # Retained conversation entries per session; older entries are
+    # dropped so long-running sessions do not grow without bound.
+    HISTORY_LIMIT = 100
+
     def __init__(self, config_dir: Optional[str] = None) -> None:
         if config_dir is None:
             config_dir = tempfile.mkdtemp()
-            atexit.register(lambda d=config_dir: os.path.isdir(d) and __import__('shutil').rmtree(d, ignore_errors=True))
+            atexit.register(lambda d=config_dir: os.path.isdir(d) and shutil.rmtree(d, ignore_errors=True))
         self.machine_manager = MachineManager(config_dir=config_dir)
         self.ssh_manager = SSHManager()
         self.command_interpreter = CommandInterpreter()
@@ -30,7 +35,9 @@ class AIAgent:
     # ------------------------------------------------------------------
     # Session management
     def create_session(self) -> str:
-        session_id = str(uuid.uuid4())
+        # .hex skips the dash formatting of str(uuid4) and yields a
+        # shorter ASCII id; the randomness is the same 128 bits.
+        session_id = uuid.uuid4().hex
         self.sessions[session_id] = ConversationContext(session_id=session_id)
         return session_id
 
@@ -43,6 +50,13 @@ class AIAgent:
             return None
         return context.conversation_history
 
+    def _append_history(self, context: ConversationContext, entry: Dict[str, Any]) -> None:
+        """Record a conversation entry, trimming past HISTORY_LIMIT."""
+        history = context.conversation_history
+        history.append(entry)
+        if len(history) > self.HISTORY_LIMIT:
+            del history[: len(history) - self.HISTORY_LIMIT]
+
     # ------------------------------------------------------------------
     # Machine management wrappers
     def add_machine(self, machine_config: Dict[str, Any]) -> Dict[str, Any]:
@@ -83,12 +97,13 @@ class AIAgent:
             return {"success": False, "error": "Cannot connect to machine"}
         context.selected_machine = machine_id
         context.last_activity = datetime.now()
-        context.conversation_history.append(
+        self._append_history(
+            context,
             {
                 "timestamp": datetime.now().isoformat(),
                 "message_type": "system",
                 "content": f"Selected machine: {machine.name} ({machine.host})",
-            }
+            },
         )
         return {
             "success": True,
@@ -131,24 +146,26 @@ class AIAgent:
         if not machine:
             return {"success": False, "error": "Selected machine not found"}
 
-        context.conversation_history.append(
+        self._append_history(
+            context,
             {
                 "timestamp": datetime.now().isoformat(),
                 "message_type": "user",
                 "content": user_input,
-            }
+            },
         )
 
         intent = self.command_interpreter.interpret_command(user_input)
         if intent.confidence < 0.5:
             suggestions = self.command_interpreter.get_command_suggestions(user_input)
             error_msg = "I don't understand that command."
-            context.conversation_history.append(
+            self._append_history(
+                context,
                 {
                     "timestamp": datetime.now().isoformat(),
                     "message_type": "assistant",
                     "content": error_msg,
-                }
+                },
             )
             return {
                 "success": False,
@@ -159,7 +176,8 @@ class AIAgent:
 
         results = self._execute_intent(machine, intent, session_id)
         summary = self._generate_summary(intent, results)
-        context.conversation_history.append(
+        self._append_history(
+            context,
             {
                 "timestamp": datetime.now().isoformat(),
                 "message_type": "assistant",
@@ -168,7 +186,7 @@ class AIAgent:
                     "intent": intent.dict(),
                     "results": [self._format_result(r) for r in results],
                 },
-            }
+            },
         )
         return {
             "success": True,
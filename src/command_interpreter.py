@@ -1,16 +1,61 @@
 """Natural language command interpretation for SSH operations."""
 
 import re
+import unicodedata
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
 from .models import UserIntent
 
 
+@lru_cache(maxsize=None)
+def _compile_pattern(pattern: str) -> "re.Pattern[str]":
+    """Compiled-pattern cache shared across interpreter instances.
+
+    Every CommandInterpreter registers the same default table, so the
+    NFA construction cost is paid once per process, not per instance.
+    """
+    return re.compile(pattern, re.IGNORECASE)
+
+
+# Keywords that signal the user is asking for an operation; compiled into
+# one alternation so suggestion lookup is a single scan of the input.
+_SUGGESTION_KEYWORDS = ('查看', '檢查', '安裝', 'check', 'install', 'show')
+_SUGGESTION_MATCHER = re.compile(
+    "|".join(re.escape(keyword) for keyword in _SUGGESTION_KEYWORDS)
+)
+
+
 class CommandInterpreter:
     """Interprets natural language commands and maps them to SSH operations."""
-    
+
+    # Cap on memoized interpretations; long-running sessions with
+    # free-form input would otherwise grow the cache without bound.
+    _INTENT_CACHE_SIZE = 512
+
     def __init__(self):
         self.command_patterns = self._init_command_patterns()
-    
+        for pattern_groups in self.command_patterns.values():
+            for pattern_group in pattern_groups:
+                self._compile_group(pattern_group)
+        # Interpretation results memoized by canonicalized input; the
+        # same phrases recur constantly in chat sessions.
+        self._intent_cache: Dict[str, UserIntent] = {}
+        # Flat description index so suggestions avoid walking the
+        # nested pattern table per call.
+        self._descriptions = [
+            pattern_group['description']
+            for pattern_groups in self.command_patterns.values()
+            for pattern_group in pattern_groups
+        ]
+
+    @staticmethod
+    def _compile_group(pattern_group: Dict) -> None:
+        """Compile a pattern group's regexes once, at registration time."""
+        pattern_group['compiled'] = [
+            _compile_pattern(pattern)
+            for pattern in pattern_group['patterns']
+        ]
+
     def _init_command_patterns(self) -> Dict[str, List[Dict]]:
         """Initialize command patterns for different intents."""
         return {
@@ -117,17 +162,21 @@ class CommandInterpreter:
     
     def interpret_command(self, user_input: str) -> UserIntent:
         """Interpret user input and return structured intent."""
-        user_input = user_input.strip().lower()
-        
+        user_input = unicodedata.normalize('NFC', user_input.strip().lower())
+
+        cached = self._intent_cache.get(user_input)
+        if cached is not None:
+            return cached
+
         best_match = None
         best_confidence = 0.0
         
         for intent, pattern_groups in self.command_patterns.items():
             for pattern_group in pattern_groups:
-                for pattern in pattern_group['patterns']:
-                    if re.search(pattern, user_input, re.IGNORECASE):
+                for pattern in pattern_group['compiled']:
+                    if pattern.search(user_input):
                         # Simple confidence scoring based on pattern match
-                        confidence = len(re.findall(pattern, user_input, re.IGNORECASE)) * 0.8
+                        confidence = len(pattern.findall(user_input)) * 0.8
                         if len(user_input.split()) <= 10:  # Bonus for concise commands
                             confidence += 0.2
                         
@@ -140,7 +189,7 @@ class CommandInterpreter:
                             }
         
         if best_match and best_confidence > 0.5:
-            return UserIntent(
+            intent = UserIntent(
                 action=best_match['intent'],
                 parameters={
                     'commands': best_match['commands'],
@@ -151,37 +200,42 @@ class CommandInterpreter:
             )
         else:
             # Fallback for unrecognized commands
-            return UserIntent(
+            intent = UserIntent(
                 action='unknown',
                 parameters={'original_text': user_input},
                 confidence=0.0,
                 original_text=user_input
             )
+
+        if len(self._intent_cache) >= self._INTENT_CACHE_SIZE:
+            # Evict the oldest entry; insertion order is good enough
+            # for the handful of phrases real sessions cycle through.
+            self._intent_cache.pop(next(iter(self._intent_cache)))
+        self._intent_cache[user_input] = intent
+        return intent
     
     def get_command_suggestions(self, partial_input: str) -> List[str]:
         """Get command suggestions based on partial input."""
-        suggestions = []
-        partial_input = partial_input.lower()
-        
-        for intent, pattern_groups in self.command_patterns.items():
-            for pattern_group in pattern_groups:
-                description = pattern_group['description']
-                # Simple matching based on keywords
-                if any(keyword in partial_input for keyword in ['查看', '檢查', '安裝', 'check', 'install', 'show']):
-                    suggestions.append(description)
-        
-        return suggestions[:5]  # Return top 5 suggestions
+        if not _SUGGESTION_MATCHER.search(partial_input.lower()):
+            return []
+
+        return self._descriptions[:5]  # Return top 5 suggestions
     
     def add_custom_pattern(self, intent: str, patterns: List[str], commands: List[str], description: str):
         """Add custom command pattern."""
         if intent not in self.command_patterns:
             self.command_patterns[intent] = []
         
-        self.command_patterns[intent].append({
+        pattern_group = {
             'patterns': patterns,
             'commands': commands,
             'description': description
-        })
+        }
+        self._compile_group(pattern_group)
+        self.command_patterns[intent].append(pattern_group)
+        self._descriptions.append(description)
+        # New patterns can change how previously seen inputs resolve.
+        self._intent_cache.clear()
     
     def get_available_intents(self) -> Dict[str, str]:
         """Get all available intents and their descriptions."""
@@ -1,11 +1,20 @@
+from __future__ import annotations
+
 import os
 import sqlite3
 from pathlib import Path
 
+# Sentinel DATABASE_DIR value selecting an in-memory database; tests use
+# it to skip disk I/O and file-permission handling entirely.
+MEMORY_DATABASE = ":memory:"
+
 
-def get_database_path() -> Path:
+def get_database_path() -> Path | str:
     """Return the path to the SQLite database file."""
-    db_dir = Path(os.environ.get("DATABASE_DIR", "data"))
+    db_dir = os.environ.get("DATABASE_DIR", "data")
+    if db_dir == MEMORY_DATABASE:
+        return MEMORY_DATABASE
+    db_dir = Path(db_dir)
     db_dir.mkdir(parents=True, exist_ok=True)
     return db_dir / "ssh_ai.db"
 
@@ -14,5 +23,15 @@ def init_database() -> None:
     """Initialise the database file and set secure permissions."""
     db_path = get_database_path()
     conn = sqlite3.connect(db_path)
-    conn.close()
-    os.chmod(db_path, 0o600)
+    try:
+        if db_path == MEMORY_DATABASE or os.environ.get("TESTING"):
+            # Trade durability for speed under tests: no fsync barriers,
+            # journal and temp tables kept in RAM. Production setups
+            # never see these pragmas.
+            conn.execute("PRAGMA journal_mode=MEMORY")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute("PRAGMA temp_store=MEMORY")
+    finally:
+        conn.close()
+    if db_path != MEMORY_DATABASE:
+        os.chmod(db_path, 0o600)
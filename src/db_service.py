@@ -1,6 +1,7 @@
 """Database service layer for machine and session management."""
 
 import json
+import logging
 import uuid
 from typing import List, Optional, Dict, Any
 from datetime import datetime
@@ -13,43 +14,55 @@ from .database import get_db, SessionLocal
 from .db_models import Machine, ConversationSession, ConversationMessage, CommandExecution
 from .models import MachineConfig, ConversationContext
 
+logger = logging.getLogger(__name__)
+
 
 class DatabaseService:
     """Service layer for database operations with encryption support."""
-    
+
+    # Fernet instances keyed by resolved key-file path. Services sharing
+    # a config dir share one cipher instead of re-reading the key file
+    # and rebuilding the cipher per instance.
+    _cipher_cache: Dict[Path, Fernet] = {}
+
     def __init__(self, config_dir: str = "config"):
         self.config_dir = Path(config_dir)
         self.config_dir.mkdir(exist_ok=True)
         self.key_file = self.config_dir / "key.key"
-        
+
         # Initialize encryption
         self._init_encryption()
-    
+
     def _init_encryption(self):
         """Initialize encryption key for password storage."""
-        if self.key_file.exists():
-            with open(self.key_file, 'rb') as f:
-                self.cipher = Fernet(f.read())
-        else:
-            key = Fernet.generate_key()
-            with open(self.key_file, 'wb') as f:
-                f.write(key)
-            self.cipher = Fernet(key)
-            # Set restrictive permissions on key file
-            os.chmod(self.key_file, 0o600)
-    
+        key_path = self.key_file.resolve()
+        cipher = self._cipher_cache.get(key_path)
+        if cipher is None:
+            if self.key_file.exists():
+                with open(self.key_file, 'rb') as f:
+                    cipher = Fernet(f.read())
+            else:
+                key = Fernet.generate_key()
+                with open(self.key_file, 'wb') as f:
+                    f.write(key)
+                cipher = Fernet(key)
+                # Set restrictive permissions on key file
+                os.chmod(self.key_file, 0o600)
+            self._cipher_cache[key_path] = cipher
+        self.cipher = cipher
+
     def _encrypt_password(self, password: str) -> str:
         """Encrypt a password for storage."""
         if not password:
             return ""
         return self.cipher.encrypt(password.encode()).decode()
-    
+
     def _decrypt_password(self, encrypted_password: str) -> str:
         """Decrypt a stored password."""
         if not encrypted_password:
             return ""
         return self.cipher.decrypt(encrypted_password.encode()).decode()
-    
+
     def _machine_to_config(self, machine: Machine) -> MachineConfig:
         """Convert database Machine to MachineConfig."""
         return MachineConfig(
@@ -64,7 +77,7 @@ class DatabaseService:
             created_at=machine.created_at,
             updated_at=machine.updated_at
         )
-    
+
     def add_machine(self, machine_config: MachineConfig) -> bool:
         """Add a new machine configuration."""
         try:
@@ -85,9 +98,9 @@ class DatabaseService:
                 db.commit()
                 return True
         except Exception as e:
-            print(f"Error adding machine: {e}")
+            logger.error(f"Error adding machine: {e}")
             return False
-    
+
     def update_machine(self, machine_id: str, updates: Dict[str, Any]) -> bool:
         """Update an existing machine configuration."""
         try:
@@ -95,20 +108,20 @@ class DatabaseService:
                 machine = db.query(Machine).filter(Machine.id == machine_id).first()
                 if not machine:
                     return False
-                
+
                 for key, value in updates.items():
                     if key == 'password' and value:
                         value = self._encrypt_password(value)
                     if hasattr(machine, key):
                         setattr(machine, key, value)
-                
+
                 machine.updated_at = datetime.now()
                 db.commit()
                 return True
         except Exception as e:
-            print(f"Error updating machine: {e}")
+            logger.error(f"Error updating machine: {e}")
             return False
-    
+
     def remove_machine(self, machine_id: str) -> bool:
         """Remove a machine configuration."""
         try:
@@ -116,14 +129,14 @@ class DatabaseService:
                 machine = db.query(Machine).filter(Machine.id == machine_id).first()
                 if not machine:
                     return False
-                
+
                 db.delete(machine)
                 db.commit()
                 return True
         except Exception as e:
-            print(f"Error removing machine: {e}")
+            logger.error(f"Error removing machine: {e}")
             return False
-    
+
     def get_machine(self, machine_id: str) -> Optional[MachineConfig]:
         """Get a specific machine configuration."""
         try:
@@ -133,9 +146,9 @@ class DatabaseService:
                     return self._machine_to_config(machine)
                 return None
         except Exception as e:
-            print(f"Error getting machine: {e}")
+            logger.error(f"Error getting machine: {e}")
             return None
-    
+
     def list_machines(self) -> List[MachineConfig]:
         """List all machine configurations."""
         try:
@@ -143,9 +156,9 @@ class DatabaseService:
                 machines = db.query(Machine).all()
                 return [self._machine_to_config(machine) for machine in machines]
         except Exception as e:
-            print(f"Error listing machines: {e}")
+            logger.error(f"Error listing machines: {e}")
             return []
-    
+
     def search_machines(self, query: str) -> List[MachineConfig]:
         """Search machines by name or description."""
         try:
@@ -158,61 +171,9 @@ class DatabaseService:
                 ).all()
                 return [self._machine_to_config(machine) for machine in machines]
         except Exception as e:
-            print(f"Error searching machines: {e}")
-            return []
-    
-    def create_session(self, session_id: str) -> bool:
-        """Create a new conversation session."""
-        try:
-            with SessionLocal() as db:
-                session = ConversationSession(
-                    id=session_id,
-                    created_at=datetime.now(),
-                    last_activity=datetime.now(),
-                    is_active=True
-                )
-                db.add(session)
-                db.commit()
-                return True
-        except Exception as e:
-            print(f"Error creating session: {e}")
-            return False
-    
-    def get_session(self, session_id: str) -> Optional[ConversationContext]:
-        """Get conversation session."""
-        try:
-            with SessionLocal() as db:
-                session = db.query(ConversationSession).filter(
-                    ConversationSession.id == session_id
-                ).first()
-                
-                if not session:
-                    return None
-                
-                # Get conversation history
-                messages = db.query(ConversationMessage).filter(
-                    ConversationMessage.session_id == session_id
-                ).order_by(ConversationMessage.timestamp).all()
-                
-                conversation_history = []
-                for msg in messages:
-                    history_item = {
-                        "timestamp": msg.timestamp.isoformat(),
-                        "message_type": msg.message_type,
-                        "content": msg.content
-                    }
-# Import logging at the top of the file
-import logging
-
-# Configure logging
-logging.basicConfig(level=logging.ERROR, format='%(asctime)s - %(levelname)s - %(message)s')
-logger = logging.getLogger(__name__)
-
-                return [self._machine_to_config(machine) for machine in machines]
-        except Exception as e:
             logger.error(f"Error searching machines: {e}")
             return []
-    
+
     def create_session(self, session_id: str) -> bool:
         """Create a new conversation session."""
         try:
@@ -229,7 +190,7 @@ logger = logging.getLogger(__name__)
         except Exception as e:
             logger.error(f"Error creating session: {e}")
             return False
-    
+
     def get_session(self, session_id: str) -> Optional[ConversationContext]:
         """Get conversation session."""
         try:
@@ -237,15 +198,15 @@ logger = logging.getLogger(__name__)
                 session = db.query(ConversationSession).filter(
                     ConversationSession.id == session_id
                 ).first()
-                
+
                 if not session:
                     return None
-                
+
                 # Get conversation history
                 messages = db.query(ConversationMessage).filter(
                     ConversationMessage.session_id == session_id
                 ).order_by(ConversationMessage.timestamp).all()
-                
+
                 conversation_history = []
                 for msg in messages:
                     history_item = {
@@ -256,7 +217,7 @@ logger = logging.getLogger(__name__)
                     if msg.extra_data:
                         history_item["metadata"] = json.loads(msg.extra_data)
                     conversation_history.append(history_item)
-                
+
                 return ConversationContext(
                     session_id=session.id,
                     selected_machine=session.machine_id,
@@ -267,7 +228,7 @@ logger = logging.getLogger(__name__)
         except Exception as e:
             logger.error(f"Error getting session: {e}")
             return None
-    
+
     def update_session_machine(self, session_id: str, machine_id: str) -> bool:
         """Update the selected machine for a session."""
         try:
@@ -275,10 +236,10 @@ logger = logging.getLogger(__name__)
                 session = db.query(ConversationSession).filter(
                     ConversationSession.id == session_id
                 ).first()
-                
+
                 if not session:
                     return False
-                
+
                 session.machine_id = machine_id
                 session.last_activity = datetime.now()
                 db.commit()
@@ -286,106 +247,8 @@ logger = logging.getLogger(__name__)
         except Exception as e:
             logger.error(f"Error updating session machine: {e}")
             return False
-                        history_item["metadata"] = json.loads(msg.extra_data)
-                    conversation_history.append(history_item)
-                
-                return ConversationContext(
-                    session_id=session.id,
-                    selected_machine=session.machine_id,
-                    conversation_history=conversation_history,
-                    created_at=session.created_at,
-                    last_activity=session.last_activity
-                )
-        except Exception as e:
-            print(f"Error getting session: {e}")
-            return None
-    
-    def update_session_machine(self, session_id: str, machine_id: str) -> bool:
-        """Update the selected machine for a session."""
-        try:
-            with SessionLocal() as db:
-                session = db.query(ConversationSession).filter(
-                    ConversationSession.id == session_id
-                ).first()
-                
-                if not session:
-                    return False
-                
-                session.machine_id = machine_id
-                session.last_activity = datetime.now()
-                db.commit()
-                return True
-        except Exception as e:
-            print(f"Error updating session machine: {e}")
-            return False
-    
-    def add_message(self, session_id: str, message_type: str, content: str, metadata: Dict = None) -> bool:
-        """Add a message to conversation history."""
-        try:
-            with SessionLocal() as db:
-                message = ConversationMessage(
-                    session_id=session_id,
-                    message_type=message_type,
-                    content=content,
-with SessionLocal() as db:
-                session = db.query(ConversationSession).filter(
-                    ConversationSession.id == session_id
-                ).first()
-                
-                if not session:
-                    return False
-                
-                session.machine_id = machine_id
-                session.last_activity = datetime.now()
-                db.commit()
-                return True
-        except Exception as e:
-            # import logging
-            logging.error(f"Error updating session machine: {e}")
-            return False
-    
-    def add_message(self, session_id: str, message_type: str, content: str, metadata: Dict = None) -> bool:
-        """Add a message to conversation history."""
-        try:
-            with SessionLocal() as db:
-                message = ConversationMessage(
-                    session_id=session_id,
-                    message_type=message_type,
-                    content=content,
-                    extra_data=json.dumps(metadata) if metadata else None,
-                    timestamp=datetime.now()
-                )
-                db.add(message)
 
-                # Update session last activity
-                session = db.query(ConversationSession).filter(
-                    ConversationSession.id == session_id
-                ).first()
-                if session:
-                    session.last_activity = datetime.now()
-
-                db.commit()
-                return True
-        except Exception as e:
-            # import logging
-            logging.error(f"Error adding message: {e}")
-            return False
-    
-    def record_command_execution(self, session_id: str, machine_id: str, 
-                               command: str, stdout: str, stderr: str, 
-                               exit_code: int, execution_time: float) -> bool:
-        """Record command execution in database."""
-        try:
-            with SessionLocal() as db:
-                execution = CommandExecution(
-                    session_id=session_id,
-                    machine_id=machine_id,
-                    command=command,
-                    stdout=stdout,
-                    timestamp=datetime.now()
-                )
-                db.add(message)
-def add_message(self, session_id: str, message_type: str, content: str, metadata: Dict = None) -> bool:
+    def add_message(self, session_id: str, message_type: str, content: str, metadata: Dict = None) -> bool:
         """Add a message to conversation history."""
         try:
             with SessionLocal() as db:
@@ -409,22 +272,11 @@ def add_message(self, session_id: str, message_type: str, content: str, metadata
                 db.commit()
                 return True
         except Exception as e:
-            print(f"Error adding message: {e}")
-                # Update session last activity
-                session = db.query(ConversationSession).filter(
-                    ConversationSession.id == session_id
-                ).first()
-                if session:
-                    session.last_activity = datetime.now()
-
-                db.commit()
-                return True
-        except Exception as e:
-            print(f"Error adding message: {e}")
+            logger.error(f"Error adding message: {e}")
             return False
-    
-    def record_command_execution(self, session_id: str, machine_id: str, 
-                               command: str, stdout: str, stderr: str, 
+
+    def record_command_execution(self, session_id: str, machine_id: str,
+                               command: str, stdout: str, stderr: str,
                                exit_code: int, execution_time: float) -> bool:
         """Record command execution in database."""
         try:
@@ -443,30 +295,30 @@ def add_message(self, session_id: str, message_type: str, content: str, metadata
                 db.commit()
                 return True
         except Exception as e:
-            print(f"Error recording command execution: {e}")
+            logger.error(f"Error recording command execution: {e}")
             return False
-    
+
     def migrate_from_json(self, json_file_path: str) -> bool:
         """Migrate machine configurations from JSON file to database."""
         try:
             json_path = Path(json_file_path)
             if not json_path.exists():
                 return True  # No file to migrate
-            
+
             with open(json_path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
-            
+
             for machine_id, machine_data in data.items():
                 # Check if machine already exists
                 existing = self.get_machine(machine_id)
                 if existing:
                     continue  # Skip existing machines
-                
+
                 # Create MachineConfig and add to database
                 machine_config = MachineConfig(**machine_data)
                 self.add_machine(machine_config)
-            
+
             return True
         except Exception as e:
-            print(f"Error migrating from JSON: {e}")
-            return False
\ No newline at end of file
+            logger.error(f"Error migrating from JSON: {e}")
+            return False
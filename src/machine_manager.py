@@ -23,6 +23,9 @@ class MachineManager:
         self.config_dir.mkdir(parents=True, exist_ok=True)
         self.store_path = self.config_dir / "machines.json"
         self.machines: Dict[str, MachineConfig] = {}
+        # Lowercased "name description host" blob per machine id, kept in
+        # step with `machines` so searches skip per-call lowercasing.
+        self._search_blobs: Dict[str, str] = {}
         self._load()
 
     # ------------------------------------------------------------------
@@ -37,7 +40,9 @@ class MachineManager:
                     cfg["password"] = base64.b64decode(password.encode()).decode()
                 except Exception:
                     cfg["password"] = None
-            self.machines[machine_id] = MachineConfig(**cfg)
+            machine = MachineConfig(**cfg)
+            self.machines[machine_id] = machine
+            self._search_blobs[machine_id] = self._build_blob(machine)
 
     def _save(self) -> None:
         data: Dict[str, Dict] = {}
@@ -48,14 +53,41 @@ class MachineManager:
             data[machine_id] = entry
         self.store_path.write_text(json.dumps(data, indent=2, default=str))
 
+    @staticmethod
+    def _build_blob(machine: MachineConfig) -> str:
+        """Build the lowercase search text for a machine."""
+        return " ".join(
+            part.lower()
+            for part in (machine.name, machine.description, machine.host)
+            if part
+        )
+
     # ------------------------------------------------------------------
     def add_machine(self, machine: MachineConfig) -> bool:
         if machine.id in self.machines:
             return False
         self.machines[machine.id] = machine
+        self._search_blobs[machine.id] = self._build_blob(machine)
         self._save()
         return True
 
+    def add_machines(self, machines: List[MachineConfig]) -> int:
+        """Add several machines with a single save.
+
+        Machines whose id is already registered are skipped. Returns the
+        number of machines actually added; the JSON store is written once
+        rather than per machine.
+        """
+        added = 0
+        for machine in machines:
+            if machine.id not in self.machines:
+                self.machines[machine.id] = machine
+                self._search_blobs[machine.id] = self._build_blob(machine)
+                added += 1
+        if added:
+            self._save()
+        return added
+
     def update_machine(self, machine_id: str, updates: Dict) -> bool:
         machine = self.machines.get(machine_id)
         if not machine:
@@ -64,7 +96,9 @@ class MachineManager:
         for key, value in updates.items():
             if value is not None:
                 data[key] = value
-        self.machines[machine_id] = MachineConfig(**data)
+        updated = MachineConfig(**data)
+        self.machines[machine_id] = updated
+        self._search_blobs[machine_id] = self._build_blob(updated)
         self._save()
         return True
 
@@ -72,6 +106,7 @@ class MachineManager:
         if machine_id not in self.machines:
             return False
         del self.machines[machine_id]
+        del self._search_blobs[machine_id]
         self._save()
         return True
 
@@ -83,12 +118,8 @@ class MachineManager:
 
     def search_machines(self, query: str) -> List[MachineConfig]:
         q = query.lower()
-        results: List[MachineConfig] = []
-        for machine in self.machines.values():
-            if (
-                q in machine.name.lower()
-                or (machine.description and q in machine.description.lower())
-                or q in machine.host.lower()
-            ):
-                results.append(machine)
-        return results
+        return [
+            self.machines[machine_id]
+            for machine_id, blob in self._search_blobs.items()
+            if q in blob
+        ]
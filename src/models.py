@@ -20,6 +20,10 @@ class MachineConfig(BaseModel):
     updated_at: datetime = Field(default_factory=datetime.now)
     
     class Config:
+        # Records are replaced, never mutated (see
+        # MachineManager.update_machine), so freezing makes instances
+        # safely shareable across sessions and hashable for caches.
+        frozen = True
         json_encoders = {
             datetime: lambda v: v.isoformat()
         }
@@ -34,7 +38,10 @@ class CommandResult(BaseModel):
     exit_code: int = Field(..., description="Command exit code")
     execution_time: float = Field(..., description="Execution time in seconds")
     timestamp: datetime = Field(default_factory=datetime.now)
-    
+
+    class Config:
+        frozen = True
+
     @property
     def success(self) -> bool:
         """Check if command executed successfully."""
@@ -49,6 +56,9 @@ class UserIntent(BaseModel):
     confidence: float = Field(..., description="Confidence score (0-1)")
     original_text: str = Field(..., description="Original user input")
 
+    class Config:
+        frozen = True
+
 
 class ConversationContext(BaseModel):
     """Context for ongoing conversation."""
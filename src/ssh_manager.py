@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
+import concurrent.futures
 import logging
+import threading
 import time
 from contextlib import contextmanager
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
 from socket import gaierror
 
 import paramiko
@@ -18,26 +20,112 @@ logger = logging.getLogger(__name__)
 class SSHManager:
     """Manage SSH connections and run commands on remote machines."""
 
+    # Remote output is read in chunks and truncated past this bound so a
+    # runaway command (e.g. tailing a huge log) cannot exhaust memory.
+    _READ_CHUNK_SIZE = 65536
+    max_output_bytes = 10 * 1024 * 1024
+
+    def __init__(self) -> None:
+        # Live clients keyed by (host, port, username); the TCP/auth
+        # handshake is paid once per machine, not once per command.
+        self._pool: Dict[Tuple[str, int, str], paramiko.SSHClient] = {}
+        self._pool_lock = threading.Lock()
+
+    def _read_stream(self, stream) -> str:
+        """Read a remote stream chunk by chunk, truncating at the cap."""
+        chunks = []
+        total = 0
+        while True:
+            chunk = stream.read(self._READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            total += len(chunk)
+            if total > self.max_output_bytes:
+                chunks.append(chunk[: len(chunk) - (total - self.max_output_bytes)])
+                chunks.append(b"\n... output truncated ...\n")
+                break
+            chunks.append(chunk)
+        return b"".join(chunks).decode("utf-8", errors="replace")
+
     def _create_client(self) -> paramiko.SSHClient:
         client = paramiko.SSHClient()
         client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
         return client
 
+    @staticmethod
+    def _pool_key(machine: MachineConfig) -> Tuple[str, int, str]:
+        return (machine.host, machine.port, machine.username)
+
+    @staticmethod
+    def _is_live(client: paramiko.SSHClient) -> bool:
+        transport = client.get_transport()
+        return transport is not None and transport.is_active()
+
+    @staticmethod
+    def _close_quietly(client: paramiko.SSHClient) -> None:
+        try:
+            client.close()
+        except Exception:
+            pass
+
+    def _get_client(self, machine: MachineConfig) -> paramiko.SSHClient:
+        """Return a pooled client for the machine, connecting on miss."""
+        key = self._pool_key(machine)
+        with self._pool_lock:
+            client = self._pool.get(key)
+        if client is not None and self._is_live(client):
+            return client
+
+        # Connect outside the lock so a slow handshake to one machine
+        # does not serialize connections to every other machine.
+        fresh = self._create_client()
+        fresh.connect(
+            hostname=machine.host,
+            port=machine.port,
+            username=machine.username,
+            password=machine.password,
+            key_filename=machine.private_key_path,
+            timeout=30,
+        )
+
+        with self._pool_lock:
+            pooled = self._pool.get(key)
+            if pooled is not None and pooled is not client and self._is_live(pooled):
+                # Another thread won the connect race; reuse its client.
+                winner = pooled
+            else:
+                self._pool[key] = fresh
+                winner = fresh
+        # Close whichever clients lost out: the stale one found at the
+        # top and/or the fresh one that was beaten to the pool.
+        for loser in (client, pooled, fresh):
+            if loser is not None and loser is not winner:
+                self._close_quietly(loser)
+        return winner
+
+    def _invalidate(self, machine: MachineConfig) -> None:
+        """Drop the pooled client for a machine after a failure."""
+        with self._pool_lock:
+            client = self._pool.pop(self._pool_key(machine), None)
+        if client is not None:
+            self._close_quietly(client)
+
+    def close_all(self) -> None:
+        """Close every pooled connection."""
+        with self._pool_lock:
+            clients = list(self._pool.values())
+            self._pool.clear()
+        for client in clients:
+            self._close_quietly(client)
+
     @contextmanager
     def get_connection(self, machine: MachineConfig):
-        client = self._create_client()
+        """Yield a pooled client, invalidating it if the caller fails."""
         try:
-            client.connect(
-                hostname=machine.host,
-                port=machine.port,
-                username=machine.username,
-                password=machine.password,
-                key_filename=machine.private_key_path,
-                timeout=30,
-            )
-            yield client
-        finally:
-            client.close()
+            yield self._get_client(machine)
+        except Exception:
+            self._invalidate(machine)
+            raise
 
     # ------------------------------------------------------------------
     def execute_command(self, machine: MachineConfig, command: str, timeout: int = 300) -> CommandResult:
@@ -45,8 +133,8 @@ class SSHManager:
         try:
             with self.get_connection(machine) as client:
                 stdin, stdout, stderr = client.exec_command(command, timeout=timeout)
-                stdout_data = stdout.read().decode("utf-8", errors="replace")
-                stderr_data = stderr.read().decode("utf-8", errors="replace")
+                stdout_data = self._read_stream(stdout)
+                stderr_data = self._read_stream(stderr)
                 exit_code = stdout.channel.recv_exit_status()
             return CommandResult(
                 command=command,
@@ -84,8 +172,27 @@ class SSHManager:
             "disk_usage": "df -h",
             "memory_usage": "free -h",
         }
-        for key, cmd in commands.items():
-            result = self.execute_command(machine, cmd)
-            if result.success:
-                info[key] = result.stdout.strip()
+        try:
+            client = self._get_client(machine)
+        except Exception as exc:
+            logger.error(f"System info probe failed for {machine.host}: {exc}")
+            return info
+
+        def probe(cmd: str) -> Tuple[int, str]:
+            # Each exec_command opens its own channel on the shared
+            # transport, so the probes overlap instead of running serially.
+            stdin, stdout, stderr = client.exec_command(cmd, timeout=10)
+            data = self._read_stream(stdout)
+            return stdout.channel.recv_exit_status(), data
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(commands)) as pool:
+            futures = {key: pool.submit(probe, cmd) for key, cmd in commands.items()}
+            for key, future in futures.items():
+                try:
+                    exit_code, data = future.result(timeout=15)
+                except Exception as exc:
+                    logger.error(f"System info probe '{key}' failed: {exc}")
+                    continue
+                if exit_code == 0:
+                    info[key] = data.strip()
         return info
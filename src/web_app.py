@@ -2,6 +2,8 @@
 
 import uuid
 import json
+
+import msgpack
 from typing import Dict, List, Optional
 from datetime import datetime
 import logging
@@ -37,18 +39,25 @@ ai_agent = AIAgent()
 class ConnectionManager:
     def __init__(self):
         self.active_connections: Dict[str, WebSocket] = {}
-    
+        # Sessions that sent a binary frame get msgpack replies; everyone
+        # else stays on JSON text frames for backward compatibility.
+        self.binary_sessions: set = set()
+
     async def connect(self, websocket: WebSocket, session_id: str):
         await websocket.accept()
         self.active_connections[session_id] = websocket
-    
+
     def disconnect(self, session_id: str):
         if session_id in self.active_connections:
             del self.active_connections[session_id]
-    
+        self.binary_sessions.discard(session_id)
+
     async def send_message(self, session_id: str, message: dict):
         if session_id in self.active_connections:
-            await self.active_connections[session_id].send_text(json.dumps(message))
+            if session_id in self.binary_sessions:
+                await self.active_connections[session_id].send_bytes(msgpack.packb(message))
+            else:
+                await self.active_connections[session_id].send_text(json.dumps(message))
 
 manager = ConnectionManager()
 
@@ -82,8 +91,7 @@ class SessionCreate(BaseModel):
 async def home(request: Request):
     """Home page with machine selection."""
     machines = ai_agent.list_machines()
-    return templates.TemplateResponse("index.html", {
-        "request": request,
+    return templates.TemplateResponse(request, "index.html", {
         "machines": machines
     })
 
@@ -107,8 +115,7 @@ async def chat_page(request: Request, session_id: str):
                 "description": machine.description
             }
     
-    return templates.TemplateResponse("chat.html", {
-        "request": request,
+    return templates.TemplateResponse(request, "chat.html", {
         "session_id": session_id,
         "selected_machine": selected_machine,
         "conversation_history": context.conversation_history
@@ -239,9 +246,17 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
     
     try:
         while True:
-            # Receive message from client
-            data = await websocket.receive_text()
-            message_data = json.loads(data)
+            # Receive message from client; binary frames carry msgpack,
+            # text frames carry JSON
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(frame.get("code", 1000))
+
+            if frame.get("bytes") is not None:
+                manager.binary_sessions.add(session_id)
+                message_data = msgpack.unpackb(frame["bytes"], raw=False)
+            else:
+                message_data = json.loads(frame["text"])
             
             if message_data["type"] == "chat_message":
                 user_message = message_data["message"]
@@ -1,12 +1,20 @@
 #!/usr/bin/env python3
 """Basic functionality test for SSH AI Assistant."""
 
+import importlib
 import sys
+from functools import lru_cache
 from pathlib import Path
 
 # Add src directory to Python path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
+
+@lru_cache(maxsize=None)
+def load_module(name):
+    """Import a project module once; later lookups hit the cache."""
+    return importlib.import_module(name)
+
 def test_imports():
     """Test that all modules can be imported."""
     try:
@@ -25,8 +33,8 @@ def test_imports():
 def test_command_interpretation():
     """Test command interpretation."""
     try:
-        from src.command_interpreter import CommandInterpreter
-        
+        CommandInterpreter = load_module("src.command_interpreter").CommandInterpreter
+
         interpreter = CommandInterpreter()
         
         # Test Chinese commands
@@ -52,8 +60,8 @@ def test_command_interpretation():
 def test_machine_config():
     """Test machine configuration."""
     try:
-        from src.models import MachineConfig
-        
+        MachineConfig = load_module("src.models").MachineConfig
+
         machine = MachineConfig(
             id="test-machine",
             name="Test Machine",
@@ -73,8 +81,8 @@ def test_machine_config():
 def test_ai_agent():
     """Test AI agent basic functionality."""
     try:
-        from src.ai_agent import AIAgent
-        
+        AIAgent = load_module("src.ai_agent").AIAgent
+
         agent = AIAgent()
         
         # Test session creation
@@ -92,15 +100,35 @@ def test_ai_agent():
         print(f"✗ AI agent error: {e}")
         return False
 
+def test_web_health():
+    """Test web app imports and health endpoint in a single client session."""
+    try:
+        from fastapi.testclient import TestClient
+        from src.web_app import app
+
+        # One TestClient session covers both the import smoke test and the
+        # health-endpoint probe instead of paying app startup twice.
+        with TestClient(app) as client:
+            response = client.get("/health")
+            assert response.status_code == 200
+            assert response.json()["status"] == "healthy"
+
+        print("✓ Web app imported and health endpoint responded in one session")
+        return True
+    except Exception as e:
+        print(f"✗ Web health error: {e}")
+        return False
+
 def main():
     """Run basic tests."""
     print("Running basic functionality tests...\n")
-    
+
     tests = [
         test_imports,
         test_command_interpretation,
         test_machine_config,
-        test_ai_agent
+        test_ai_agent,
+        test_web_health
     ]
     
     passed = 0
@@ -3,12 +3,27 @@
 
 import subprocess
 import sys
+import threading
 import time
+from collections import deque
 from pathlib import Path
 
 
-def run_command(cmd, cwd=None, timeout=60):
-    """Run a command and return the result."""
+# Results of idempotent probe commands, keyed by (cmd, cwd).
+_probe_cache = {}
+
+
+def run_command(cmd, cwd=None, timeout=60, cache=False):
+    """Run a command and return the result.
+
+    Pass cache=True for idempotent probes (config validation, --help,
+    health checks) so repeated invocations reuse the first result
+    instead of spawning another subprocess.
+    """
+    cache_key = (cmd, str(cwd))
+    if cache and cache_key in _probe_cache:
+        return _probe_cache[cache_key]
+
     try:
         result = subprocess.run(
             cmd,
@@ -18,24 +33,70 @@ def run_command(cmd, cwd=None, timeout=60):
             text=True,
             timeout=timeout
         )
-        return result.returncode == 0, result.stdout, result.stderr
+        outcome = result.returncode == 0, result.stdout, result.stderr
     except subprocess.TimeoutExpired:
         return False, "", "Command timed out"
     except Exception as e:
         return False, "", str(e)
 
+    if cache:
+        _probe_cache[cache_key] = outcome
+    return outcome
+
+
+def run_streaming_command(cmd, cwd=None, timeout=300):
+    """Run a long command, consuming its output line by line.
+
+    Unlike run_command, the output is drained through a line-buffered
+    pipe instead of being accumulated by capture_output, so multi-minute
+    builds do not hold their whole log in memory; only the tail is kept
+    for error reporting. A reader thread drains the pipe while the main
+    thread enforces the deadline, so a build that keeps the pipe open
+    without exiting still times out, and an ERROR line terminates the
+    build early instead of letting it run to completion.
+    """
+    try:
+        process = subprocess.Popen(
+            cmd,
+            shell=True,
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1
+        )
+        tail = deque(maxlen=20)
+
+        def drain():
+            for line in process.stdout:
+                tail.append(line)
+                if line.startswith("ERROR"):
+                    process.terminate()
+                    break
+
+        reader = threading.Thread(target=drain, daemon=True)
+        reader.start()
+        returncode = process.wait(timeout=timeout)
+        reader.join(timeout=5)
+        return returncode == 0, "", "" if returncode == 0 else "".join(tail)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        return False, "", "Command timed out"
+    except Exception as e:
+        return False, "", str(e)
+
 
 def test_docker_build():
     """Test Docker image build."""
     print("Testing Docker build...")
-    
+
     project_root = Path(__file__).parent
-    success, stdout, stderr = run_command(
+    success, stdout, stderr = run_streaming_command(
         "docker build -t ssh-ai-assistant-test .",
         cwd=project_root,
         timeout=300  # 5 minutes for build
     )
-    
+
     if success:
         print("✓ Docker build successful")
         return True
@@ -71,7 +132,8 @@ def test_docker_compose():
     # Test config validation
     success, stdout, stderr = run_command(
         "docker-compose config",
-        cwd=project_root
+        cwd=project_root,
+        cache=True
     )
     
     if success:
@@ -89,7 +151,8 @@ def test_health_check():
     project_root = Path(__file__).parent
     success, stdout, stderr = run_command(
         "python healthcheck.py",
-        cwd=project_root
+        cwd=project_root,
+        cache=True
     )
     
     if success:
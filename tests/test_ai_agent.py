@@ -1,7 +1,7 @@
 """Tests for AI agent."""
 
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import patch
 from src.ai_agent import AIAgent
 from src.models import MachineConfig, CommandResult, UserIntent
 
@@ -9,16 +9,22 @@ from src.models import MachineConfig, CommandResult, UserIntent
 class TestAIAgent:
     """Test AIAgent class."""
     
-    def setup_method(self):
-        """Setup test fixtures."""
-        self.agent = AIAgent()
-        self.test_machine = MachineConfig(
+    @pytest.fixture(scope="class")
+    def test_machine(self):
+        """One shared config for the class; no test here mutates it."""
+        return MachineConfig(
             id="test-machine",
             name="Test Machine",
             host="test.example.com",
             username="testuser",
             password="testpass"
         )
+
+    @pytest.fixture(autouse=True)
+    def setup(self, ai_agent, test_machine):
+        """Wire the shared fixtures into each test."""
+        self.agent = ai_agent
+        self.test_machine = test_machine
     
     def test_create_session(self):
         """Test creating a new session."""
@@ -59,31 +65,44 @@ class TestAIAgent:
         assert "summary" in result
         assert len(result["results"]) == 1
     
-    def test_process_command_no_machine_selected(self):
-        """Test command processing without machine selection."""
-        session_id = self.agent.create_session()
-        
-        result = self.agent.process_command(session_id, "check os version")
-        
-        assert result["success"] is False
-        assert "No machine selected" in result["error"]
-    
-    def test_process_command_unknown_intent(self):
-        """Test processing unknown command."""
-        session_id = self.agent.create_session()
-        self.agent.machine_manager.add_machine(self.test_machine)
-        self.agent.select_machine(session_id, "test-machine")
-        
-        result = self.agent.process_command(session_id, "do something completely random")
-        
+    @pytest.mark.parametrize("select_machine,query,err_substr", [
+        (False, "check os version", "No machine selected"),
+        (True, "do something completely random", "don't understand"),
+        (None, "test command", "Invalid session"),
+    ])
+    def test_process_command_error_paths(self, select_machine, query, err_substr):
+        """Test process_command error handling, one node per path.
+
+        select_machine=None drives an invalid session id; False a valid
+        session with no machine; True a session with a machine selected
+        but an unrecognized command.
+        """
+        if select_machine is None:
+            session_id = "invalid-session"
+        else:
+            session_id = self.agent.create_session()
+            if select_machine:
+                self.agent.machine_manager.add_machine(self.test_machine)
+                self.agent.select_machine(session_id, "test-machine")
+
+        result = self.agent.process_command(session_id, query)
+
         assert result["success"] is False
-        assert "don't understand" in result["error"]
-        assert "suggestions" in result or "available_commands" in result
-    
-    @patch('src.ai_agent.SSHManager.test_connection')
-    def test_select_machine_success(self, mock_test_connection):
+        assert err_substr in result["error"]
+
+        if select_machine is True:
+            assert "suggestions" in result or "available_commands" in result
+        if select_machine is None:
+            # Machine selection rejects the invalid session the same way
+            select_result = self.agent.select_machine(session_id, "test-machine")
+            assert select_result["success"] is False
+            assert "Invalid session" in select_result["error"]
+
+    def test_select_machine_success(self, monkeypatch):
         """Test successful machine selection."""
-        mock_test_connection.return_value = True
+        monkeypatch.setattr(
+            "src.ai_agent.SSHManager.test_connection", lambda self, machine: True
+        )
         
         session_id = self.agent.create_session()
         self.agent.machine_manager.add_machine(self.test_machine)
@@ -94,10 +113,11 @@ class TestAIAgent:
         assert result["machine"]["id"] == "test-machine"
         assert result["machine"]["name"] == "Test Machine"
     
-    @patch('src.ai_agent.SSHManager.test_connection')
-    def test_select_machine_connection_failed(self, mock_test_connection):
+    def test_select_machine_connection_failed(self, monkeypatch):
         """Test machine selection with connection failure."""
-        mock_test_connection.return_value = False
+        monkeypatch.setattr(
+            "src.ai_agent.SSHManager.test_connection", lambda self, machine: False
+        )
         
         session_id = self.agent.create_session()
         self.agent.machine_manager.add_machine(self.test_machine)
@@ -116,10 +136,11 @@ class TestAIAgent:
         assert result["success"] is False
         assert "Machine not found" in result["error"]
     
-    @patch('src.ai_agent.SSHManager.test_connection')
-    def test_add_machine_success(self, mock_test_connection):
+    def test_add_machine_success(self, monkeypatch):
         """Test successful machine addition."""
-        mock_test_connection.return_value = True
+        monkeypatch.setattr(
+            "src.ai_agent.SSHManager.test_connection", lambda self, machine: True
+        )
         
         machine_config = {
             "id": "new-machine",
@@ -139,10 +160,11 @@ class TestAIAgent:
         assert len(machines) == 1
         assert machines[0]["id"] == "new-machine"
     
-    @patch('src.ai_agent.SSHManager.test_connection')
-    def test_add_machine_connection_failed(self, mock_test_connection):
+    def test_add_machine_connection_failed(self, monkeypatch):
         """Test machine addition with connection failure."""
-        mock_test_connection.return_value = False
+        monkeypatch.setattr(
+            "src.ai_agent.SSHManager.test_connection", lambda self, machine: False
+        )
         
         machine_config = {
             "id": "bad-machine",
@@ -173,9 +195,8 @@ class TestAIAgent:
             username="user2"
         )
         
-        self.agent.machine_manager.add_machine(machine1)
-        self.agent.machine_manager.add_machine(machine2)
-        
+        self.agent.machine_manager.add_machines([machine1, machine2])
+
         machines = self.agent.list_machines()
         
         assert len(machines) == 2
@@ -202,12 +223,3 @@ class TestAIAgent:
         assert history is not None
         assert len(history) == 0  # Initially empty
     
-    def test_invalid_session(self):
-        """Test operations with invalid session."""
-        result = self.agent.process_command("invalid-session", "test command")
-        assert result["success"] is False
-        assert "Invalid session" in result["error"]
-        
-        result = self.agent.select_machine("invalid-session", "test-machine")
-        assert result["success"] is False
-        assert "Invalid session" in result["error"]
\ No newline at end of file
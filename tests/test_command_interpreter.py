@@ -11,40 +11,30 @@ class TestCommandInterpreter:
         """Setup test fixtures."""
         self.interpreter = CommandInterpreter()
     
-    def test_check_os_version_chinese(self):
-        """Test OS version check in Chinese."""
-        intent = self.interpreter.interpret_command("幫我查看這台作業系統版本")
-        
-        assert intent.action == "check_os_version"
+    @pytest.mark.parametrize("query,action,expected_command", [
+        ("幫我查看這台作業系統版本", "check_os_version", "uname"),
+        ("幫我安裝CUDA", "install_cuda", "cuda"),
+        ("幫我檢查當前裝置有哪些設備", "check_devices", "lspci"),
+    ])
+    def test_known_commands_chinese(self, query, action, expected_command):
+        """Test known commands in Chinese, one node per phrase."""
+        intent = self.interpreter.interpret_command(query)
+
+        assert intent.action == action
         assert intent.confidence > 0.5
         assert "commands" in intent.parameters
-        assert any("uname" in cmd for cmd in intent.parameters["commands"])
-    
+        assert any(
+            expected_command in cmd.lower()
+            for cmd in intent.parameters["commands"]
+        )
+
     def test_check_os_version_english(self):
         """Test OS version check in English."""
         intent = self.interpreter.interpret_command("check os version")
-        
+
         assert intent.action == "check_os_version"
         assert intent.confidence > 0.5
-    
-    def test_install_cuda_chinese(self):
-        """Test CUDA installation in Chinese."""
-        intent = self.interpreter.interpret_command("幫我安裝CUDA")
-        
-        assert intent.action == "install_cuda"
-        assert intent.confidence > 0.5
-        assert "commands" in intent.parameters
-        assert any("cuda" in cmd.lower() for cmd in intent.parameters["commands"])
-    
-    def test_check_devices_chinese(self):
-        """Test device check in Chinese."""
-        intent = self.interpreter.interpret_command("幫我檢查當前裝置有哪些設備")
-        
-        assert intent.action == "check_devices"
-        assert intent.confidence > 0.5
-        assert "commands" in intent.parameters
-        assert any("lspci" in cmd for cmd in intent.parameters["commands"])
-    
+
     def test_unknown_command(self):
         """Test unknown command handling."""
         intent = self.interpreter.interpret_command("do something completely random")
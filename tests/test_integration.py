@@ -1,48 +1,37 @@
 """Integration tests for complete workflows."""
 
 import pytest
-import tempfile
-import shutil
-from unittest.mock import patch, Mock
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
 from pathlib import Path
 
 from src.ai_agent import AIAgent
 from src.machine_manager import MachineManager
 from src.models import MachineConfig, CommandResult
 
+from tests.conftest import FakeSSHClient
+
 
 @pytest.mark.integration
 class TestCompleteWorkflow:
     """Test complete user workflows from start to finish."""
     
-    def setup_method(self):
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
         """Setup test environment."""
-        self.temp_dir = tempfile.mkdtemp()
+        self.temp_dir = str(tmp_path)
         self.agent = AIAgent(config_dir=self.temp_dir)
-    
-    def teardown_method(self):
-        """Cleanup test environment."""
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-    
+
     @patch('src.ssh_manager.paramiko.SSHClient')
     def test_complete_session_workflow(self, mock_ssh_client):
         """Test complete session from creation to command execution."""
-        # Mock SSH client
-        mock_client = Mock()
-        mock_ssh_client.return_value = mock_client
-        
-        # Mock successful connection
-        mock_client.connect.return_value = None
-        
-        # Mock command execution
-        mock_stdin = Mock()
-        mock_stdout = Mock()
-        mock_stderr = Mock()
-        mock_stdout.read.return_value = b"Linux test-server 5.4.0\n"
-        mock_stderr.read.return_value = b""
-        mock_stdout.channel.recv_exit_status.return_value = 0
-        mock_client.exec_command.return_value = (mock_stdin, mock_stdout, mock_stderr)
-        
+        # Fake SSH client; the connection test echoes back its probe
+        # string while every other command reports the OS version.
+        mock_ssh_client.return_value = FakeSSHClient(
+            stdout=b"Linux test-server 5.4.0\n",
+            responses={"echo connection_test": b"connection_test\n"},
+        )
+
         # Step 1: Create session
         session_id = self.agent.create_session()
         assert session_id is not None
@@ -72,16 +61,18 @@ class TestCompleteWorkflow:
         # Step 5: Verify conversation history
         history = self.agent.get_conversation_history(session_id)
         assert len(history) > 0
-        assert any("作業系統版本" in entry.get("user_message", "") for entry in history)
+        assert any(
+            entry.get("message_type") == "user"
+            and "作業系統版本" in entry.get("content", "")
+            for entry in history
+        )
     
     @patch('src.ssh_manager.paramiko.SSHClient')
     def test_multi_machine_workflow(self, mock_ssh_client):
         """Test workflow with multiple machines."""
-        # Setup mock
-        mock_client = Mock()
-        mock_ssh_client.return_value = mock_client
-        mock_client.connect.return_value = None
-        
+        # Setup fake whose connection test succeeds
+        mock_ssh_client.return_value = FakeSSHClient(stdout=b"connection_test\n")
+
         # Create session
         session_id = self.agent.create_session()
         
@@ -145,22 +136,17 @@ class TestCompleteWorkflow:
 class TestPersistenceWorkflow:
     """Test data persistence across sessions."""
     
-    def setup_method(self):
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
         """Setup test environment."""
-        self.temp_dir = tempfile.mkdtemp()
-    
-    def teardown_method(self):
-        """Cleanup test environment."""
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-    
+        self.temp_dir = str(tmp_path)
+
     @patch('src.ssh_manager.paramiko.SSHClient')
     def test_machine_persistence(self, mock_ssh_client):
         """Test that machine configurations persist across agent instances."""
-        # Mock SSH client
-        mock_client = Mock()
-        mock_ssh_client.return_value = mock_client
-        mock_client.connect.return_value = None
-        
+        # Fake SSH client whose connection test succeeds
+        mock_ssh_client.return_value = FakeSSHClient(stdout=b"connection_test\n")
+
         # Create first agent instance and add machine
         agent1 = AIAgent(config_dir=self.temp_dir)
         
@@ -191,41 +177,10 @@ class TestPersistenceWorkflow:
         # Add machine with password
         machine = MachineConfig(
             id="secure-machine",
-            name="Secure Machine", 
-            host="secure.example.com",
-            username="secureuser",
-def test_password_encryption_persistence(self):
-        """Test that passwords remain encrypted when persisted."""
-        # Create machine manager
-        manager = MachineManager(config_dir=self.temp_dir)
-        
-        # Add machine with password
-        # Import os to use environment variables for secure password storage
-        import os
-        machine = MachineConfig(
-            id="secure-machine",
-            name="Secure Machine", 
+            name="Secure Machine",
             host="secure.example.com",
             username="secureuser",
-            password=os.getenv("SECURE_MACHINE_PASSWORD")
-        )
-        
-        manager.add_machine(machine)
-        
-        # Check that password is encrypted in storage
-        config_file = Path(self.temp_dir) / "machines.json"
-        assert config_file.exists()
-        
-        # Read raw file content
-        with open(config_file, 'r') as f:
-            content = f.read()
-        
-        # Password should not appear in plain text
-        assert "supersecret123" not in content
-        
-        # But should be decryptable when retrieved
-        retrieved = manager.get_machine("secure-machine")
-        assert retrieved.password == os.getenv("SECURE_MACHINE_PASSWORD")
+            password="supersecret123"
         )
         
         manager.add_machine(machine)
@@ -246,66 +201,58 @@ def test_password_encryption_persistence(self):
         assert retrieved.password == "supersecret123"
 
 
+@pytest.fixture(scope="module")
+def thread_pool():
+    """Shared worker pool so the concurrency tests reuse threads."""
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        yield pool
+
+
 @pytest.mark.integration
 @pytest.mark.slow
 class TestConcurrentOperations:
     """Test concurrent operations and thread safety."""
     
-    def setup_method(self):
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
         """Setup test environment."""
-        self.temp_dir = tempfile.mkdtemp()
+        self.temp_dir = str(tmp_path)
         self.agent = AIAgent(config_dir=self.temp_dir)
-    
-    def teardown_method(self):
-        """Cleanup test environment."""
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-    
-    def test_concurrent_sessions(self):
+
+    def test_concurrent_sessions(self, thread_pool):
         """Test multiple concurrent sessions."""
         import threading
-        import time
-        
+
         sessions = []
         results = []
-        
-        def create_session():
+        # The barrier lines all workers up so session creation and lookup
+        # genuinely race instead of sleeping through each other.
+        barrier = threading.Barrier(5)
+
+        def create_session(_):
             session_id = self.agent.create_session()
             sessions.append(session_id)
-            
-            # Simulate some work
-            time.sleep(0.1)
-            
+
+            barrier.wait()
+
             context = self.agent.get_session(session_id)
             results.append(context is not None)
-        
-        # Create multiple threads
-        threads = []
-        for _ in range(5):
-            thread = threading.Thread(target=create_session)
-            threads.append(thread)
-            thread.start()
-        
-        # Wait for all threads to complete
-        for thread in threads:
-            thread.join()
-        
+
+        list(thread_pool.map(create_session, range(5)))
+
         # Verify all sessions were created successfully
         assert len(sessions) == 5
         assert all(results)
         assert len(set(sessions)) == 5  # All session IDs should be unique
     
     @patch('src.ssh_manager.paramiko.SSHClient')
-    def test_concurrent_machine_operations(self, mock_ssh_client):
+    def test_concurrent_machine_operations(self, mock_ssh_client, thread_pool):
         """Test concurrent machine operations."""
-        import threading
-        
-        # Mock SSH client
-        mock_client = Mock()
-        mock_ssh_client.return_value = mock_client
-        mock_client.connect.return_value = None
-        
+        # Fake SSH client whose connection test succeeds
+        mock_ssh_client.return_value = FakeSSHClient(stdout=b"connection_test\n")
+
         results = []
-        
+
         def add_machine(machine_id):
             machine_config = {
                 "id": f"machine-{machine_id}",
@@ -317,18 +264,9 @@ class TestConcurrentOperations:
             
             result = self.agent.add_machine(machine_config)
             results.append(result["success"])
-        
-        # Create multiple threads to add machines concurrently
-        threads = []
-        for i in range(3):
-            thread = threading.Thread(target=add_machine, args=(i,))
-            threads.append(thread)
-            thread.start()
-        
-        # Wait for all threads to complete
-        for thread in threads:
-            thread.join()
-        
+
+        list(thread_pool.map(add_machine, range(3)))
+
         # Verify all machines were added successfully
         assert all(results)
         
@@ -1,8 +1,6 @@
 """Tests for machine manager."""
 
 import pytest
-import tempfile
-import shutil
 from pathlib import Path
 from src.machine_manager import MachineManager
 from src.models import MachineConfig
@@ -10,16 +8,13 @@ from src.models import MachineConfig
 
 class TestMachineManager:
     """Test MachineManager class."""
-    
-    def setup_method(self):
-        """Setup test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.manager = MachineManager(config_dir=self.temp_dir)
-    
-    def teardown_method(self):
-        """Cleanup test fixtures."""
-        shutil.rmtree(self.temp_dir)
-    
+
+    @pytest.fixture(autouse=True)
+    def setup(self, machine_manager, tmp_path):
+        """Wire the isolated manager fixture into each test."""
+        self.manager = machine_manager
+        self.temp_dir = str(tmp_path)
+
     def test_add_machine(self):
         """Test adding a machine."""
         machine = MachineConfig(
@@ -84,6 +79,27 @@ class TestMachineManager:
         assert "machine1" in machine_ids
         assert "machine2" in machine_ids
     
+    def test_add_machines_bulk(self):
+        """Test adding multiple machines with a single save."""
+        machines = [
+            MachineConfig(
+                id=f"bulk-{i}",
+                name=f"Bulk {i}",
+                host=f"bulk{i}.com",
+                username="user"
+            )
+            for i in range(3)
+        ]
+
+        added = self.manager.add_machines(machines)
+        assert added == 3
+        assert len(self.manager.list_machines()) == 3
+
+        # Duplicates are skipped
+        added = self.manager.add_machines(machines)
+        assert added == 0
+        assert len(self.manager.list_machines()) == 3
+
     def test_update_machine(self):
         """Test updating a machine."""
         machine = MachineConfig(
@@ -128,37 +144,29 @@ class TestMachineManager:
         # Verify removal
         assert self.manager.get_machine("remove-machine") is None
     
-    def test_search_machines(self):
-        """Test searching machines."""
-        machine1 = MachineConfig(
-            id="web-server",
-            name="Web Server",
-            host="web.example.com",
-            username="webuser",
-            description="Production web server"
-        )
-        
-        machine2 = MachineConfig(
-            id="db-server",
-            name="Database Server",
-            host="db.example.com",
-            username="dbuser",
-            description="Production database"
-        )
-        
-        self.manager.add_machine(machine1)
-        self.manager.add_machine(machine2)
-        
-        # Search by name
-        results = self.manager.search_machines("web")
-        assert len(results) == 1
-        assert results[0].id == "web-server"
-        
-        # Search by description
-        results = self.manager.search_machines("production")
-        assert len(results) == 2
-        
-        # Search by host
-        results = self.manager.search_machines("db.example")
-        assert len(results) == 1
-        assert results[0].id == "db-server"
\ No newline at end of file
+    @pytest.mark.parametrize("term,expected_ids", [
+        ("web", {"web-server"}),               # by name
+        ("production", {"web-server", "db-server"}),  # by description
+        ("db.example", {"db-server"}),         # by host
+    ])
+    def test_search_machines(self, term, expected_ids):
+        """Test searching machines, one node per search field."""
+        self.manager.add_machines([
+            MachineConfig(
+                id="web-server",
+                name="Web Server",
+                host="web.example.com",
+                username="webuser",
+                description="Production web server"
+            ),
+            MachineConfig(
+                id="db-server",
+                name="Database Server",
+                host="db.example.com",
+                username="dbuser",
+                description="Production database"
+            ),
+        ])
+
+        results = self.manager.search_machines(term)
+        assert {machine.id for machine in results} == expected_ids
\ No newline at end of file
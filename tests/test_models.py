@@ -8,66 +8,55 @@ from src.models import MachineConfig, CommandResult, UserIntent, ConversationCon
 class TestMachineConfig:
     """Test MachineConfig model."""
     
-    def test_machine_config_creation(self):
-        """Test creating a machine configuration."""
-        config = MachineConfig(
-            id="test-machine",
-            name="Test Machine",
-            host="192.168.1.100",
-            username="testuser",
-            password="testpass"
-        )
-        
-        assert config.id == "test-machine"
-        assert config.name == "Test Machine"
-        assert config.host == "192.168.1.100"
-        assert config.port == 22  # default value
-        assert config.username == "testuser"
-        assert config.password == "testpass"
-    
-    def test_machine_config_with_key(self):
-        """Test machine config with private key."""
-        config = MachineConfig(
-            id="key-machine",
-            name="Key Machine",
-            host="example.com",
-            username="keyuser",
-            private_key_path="/path/to/key"
-        )
-        
-        assert config.private_key_path == "/path/to/key"
-        assert config.password is None
+    @pytest.mark.parametrize("kwargs,expected", [
+        pytest.param(
+            dict(id="test-machine", name="Test Machine", host="192.168.1.100",
+                 username="testuser", password="testpass"),
+            {"id": "test-machine", "name": "Test Machine",
+             "host": "192.168.1.100", "port": 22, "username": "testuser",
+             "password": "testpass"},
+            id="with-password",
+        ),
+        pytest.param(
+            dict(id="key-machine", name="Key Machine", host="example.com",
+                 username="keyuser", private_key_path="/path/to/key"),
+            {"private_key_path": "/path/to/key", "password": None},
+            id="with-key",
+        ),
+    ])
+    def test_machine_config_creation(self, kwargs, expected):
+        """Test creating machine configurations with different credentials."""
+        config = MachineConfig(**kwargs)
+
+        for field, value in expected.items():
+            assert getattr(config, field) == value
 
 
 class TestCommandResult:
     """Test CommandResult model."""
     
-    def test_successful_command_result(self):
-        """Test successful command result."""
-        result = CommandResult(
-            command="echo 'hello'",
-            stdout="hello\n",
-            stderr="",
-            exit_code=0,
-            execution_time=0.1
-        )
-        
-        assert result.success is True
-        assert result.command == "echo 'hello'"
-        assert result.stdout == "hello\n"
-    
-    def test_failed_command_result(self):
-        """Test failed command result."""
-        result = CommandResult(
-            command="invalid_command",
-            stdout="",
-            stderr="command not found",
-            exit_code=127,
-            execution_time=0.05
-        )
-        
-        assert result.success is False
-        assert result.exit_code == 127
+    @pytest.mark.parametrize("kwargs,success", [
+        pytest.param(
+            dict(command="echo 'hello'", stdout="hello\n", stderr="",
+                 exit_code=0, execution_time=0.1),
+            True,
+            id="success",
+        ),
+        pytest.param(
+            dict(command="invalid_command", stdout="",
+                 stderr="command not found", exit_code=127,
+                 execution_time=0.05),
+            False,
+            id="failure",
+        ),
+    ])
+    def test_command_result(self, kwargs, success):
+        """Test command results for both exit paths."""
+        result = CommandResult(**kwargs)
+
+        assert result.success is success
+        assert result.command == kwargs["command"]
+        assert result.exit_code == kwargs["exit_code"]
 
 
 class TestUserIntent:
@@ -1,33 +1,66 @@
 """Tests for the web application."""
 
+import asyncio
 import pytest
+import pytest_asyncio
 import json
+import msgpack
 import tempfile
 import os
 from pathlib import Path
 from fastapi.testclient import TestClient
+from httpx import AsyncClient, ASGITransport
 
 # Set up test environment
 os.environ['DATABASE_URL'] = 'sqlite:///test.db'
 
 from src.web_app import app
-from src.database import init_database, get_database_path
+from src.database import init_database, get_database_path, MEMORY_DATABASE
 
 
-@pytest.fixture
-def client():
-    """Create test client."""
-    # Use temporary database for testing
-    with tempfile.TemporaryDirectory() as temp_dir:
-        # Set database path to temp directory
-        os.environ['DATABASE_DIR'] = temp_dir
-        
-        # Initialize test database
+@pytest.fixture(scope="module", autouse=True)
+def test_db():
+    """Point the module at an in-memory database.
+
+    test_database_initialization still covers the on-disk path.
+    """
+    os.environ['DATABASE_DIR'] = MEMORY_DATABASE
+    try:
         init_database()
-        
-        # Create test client
-        with TestClient(app) as test_client:
-            yield test_client
+        yield
+    finally:
+        os.environ.pop('DATABASE_DIR', None)
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def async_client(test_db):
+    """Shared ASGI-transport client for the plain HTTP tests.
+
+    Talking to the app in-process skips TestClient's per-enter portal
+    thread and lifespan churn; per-test isolation is handled by
+    reset_state below.
+    """
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+@pytest.fixture(scope="module")
+def client(test_db):
+    """TestClient kept for the WebSocket tests; ASGITransport has no
+    websocket support."""
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(autouse=True)
+def reset_state():
+    """Drop sessions and machines the shared app accumulated in a test."""
+    yield
+    from src.web_app import ai_agent
+    ai_agent.sessions.clear()
+    for machine in ai_agent.machine_manager.list_machines():
+        ai_agent.machine_manager.remove_machine(machine.id)
 
 
 @pytest.fixture
@@ -46,36 +79,36 @@ def sample_machine():
 class TestWebApp:
     """Test cases for web application."""
     
-    def test_health_check(self, client):
+    async def test_health_check(self, async_client):
         """Test health check endpoint."""
-        response = client.get("/health")
+        response = await async_client.get("/health")
         assert response.status_code == 200
         data = response.json()
         assert data["status"] == "healthy"
         assert "timestamp" in data
     
-    def test_home_page(self, client):
+    async def test_home_page(self, async_client):
         """Test home page renders."""
-        response = client.get("/")
+        response = await async_client.get("/")
         assert response.status_code == 200
         assert "text/html" in response.headers["content-type"]
     
-    def test_create_session(self, client):
+    async def test_create_session(self, async_client):
         """Test session creation."""
-        response = client.post("/api/sessions")
+        response = await async_client.post("/api/sessions")
         assert response.status_code == 200
         data = response.json()
         assert "session_id" in data
         assert len(data["session_id"]) > 0
     
-    def test_get_session(self, client):
+    async def test_get_session(self, async_client):
         """Test getting session information."""
         # Create session first
-        create_response = client.post("/api/sessions")
+        create_response = await async_client.post("/api/sessions")
         session_id = create_response.json()["session_id"]
         
         # Get session info
-        response = client.get(f"/api/sessions/{session_id}")
+        response = await async_client.get(f"/api/sessions/{session_id}")
         assert response.status_code == 200
         data = response.json()
         assert data["session_id"] == session_id
@@ -84,70 +117,93 @@ class TestWebApp:
         assert "last_activity" in data
         assert "conversation_history" in data
     
-    def test_get_nonexistent_session(self, client):
+    async def test_get_nonexistent_session(self, async_client):
         """Test getting non-existent session."""
-        response = client.get("/api/sessions/nonexistent")
+        response = await async_client.get("/api/sessions/nonexistent")
         assert response.status_code == 404
     
-    def test_list_machines_empty(self, client):
+    async def test_list_machines_empty(self, async_client):
         """Test listing machines when none exist."""
-        response = client.get("/api/machines")
+        response = await async_client.get("/api/machines")
         assert response.status_code == 200
         data = response.json()
         assert isinstance(data, list)
         assert len(data) == 0
     
-    def test_create_machine(self, client, sample_machine):
+    async def test_create_machine(self, async_client, sample_machine):
         """Test creating a machine configuration."""
         # Note: This will fail connection test, but we're testing the API structure
-        response = client.post("/api/machines", json=sample_machine)
+        response = await async_client.post("/api/machines", json=sample_machine)
         # Expect 400 because connection will fail to localhost
         assert response.status_code == 400
         data = response.json()
         assert "detail" in data
     
-    def test_create_machine_invalid_data(self, client):
+    async def test_concurrent_machine_creation(self, async_client, monkeypatch):
+        """Test that concurrent machine adds all land on the async path."""
+        from src.web_app import ai_agent
+        monkeypatch.setattr(ai_agent.ssh_manager, "test_connection", lambda machine: True)
+
+        # Fan the adds out together; a handler that blocked the event
+        # loop would serialize these
+        responses = await asyncio.gather(*[
+            async_client.post("/api/machines", json={
+                "name": f"Machine {i}",
+                "host": f"10.0.1.{i}",
+                "username": "testuser",
+                "password": "testpass"
+            })
+            for i in range(10)
+        ])
+        assert all(response.status_code == 200 for response in responses)
+
+        response = await async_client.get("/api/machines")
+        assert response.status_code == 200
+        names = {machine["name"] for machine in response.json()}
+        assert names == {f"Machine {i}" for i in range(10)}
+
+    async def test_create_machine_invalid_data(self, async_client):
         """Test creating machine with invalid data."""
         invalid_machine = {
             "name": "",  # Empty name should fail validation
             "host": "localhost"
             # Missing required fields
         }
-        response = client.post("/api/machines", json=invalid_machine)
+        response = await async_client.post("/api/machines", json=invalid_machine)
         assert response.status_code == 422  # Validation error
     
-    def test_get_nonexistent_machine(self, client):
+    async def test_get_nonexistent_machine(self, async_client):
         """Test getting non-existent machine."""
-        response = client.get("/api/machines/nonexistent")
+        response = await async_client.get("/api/machines/nonexistent")
         assert response.status_code == 404
     
-    def test_update_nonexistent_machine(self, client):
+    async def test_update_nonexistent_machine(self, async_client):
         """Test updating non-existent machine."""
         updates = {"name": "Updated Name"}
-        response = client.put("/api/machines/nonexistent", json=updates)
+        response = await async_client.put("/api/machines/nonexistent", json=updates)
         assert response.status_code == 404
     
-    def test_delete_nonexistent_machine(self, client):
+    async def test_delete_nonexistent_machine(self, async_client):
         """Test deleting non-existent machine."""
-        response = client.delete("/api/machines/nonexistent")
+        response = await async_client.delete("/api/machines/nonexistent")
         assert response.status_code == 404
     
-    def test_search_machines_empty(self, client):
+    async def test_search_machines_empty(self, async_client):
         """Test searching machines when none exist."""
-        response = client.get("/api/machines/search/test")
+        response = await async_client.get("/api/machines/search/test")
         assert response.status_code == 200
         data = response.json()
         assert isinstance(data, list)
         assert len(data) == 0
     
-    def test_select_machine_invalid_session(self, client):
+    async def test_select_machine_invalid_session(self, async_client):
         """Test selecting machine with invalid session."""
-        response = client.post("/api/sessions/invalid/select-machine/machine123")
+        response = await async_client.post("/api/sessions/invalid/select-machine/machine123")
         assert response.status_code == 404
     
-    def test_chat_page_invalid_session(self, client):
+    async def test_chat_page_invalid_session(self, async_client):
         """Test chat page with invalid session."""
-        response = client.get("/chat/invalid")
+        response = await async_client.get("/chat/invalid")
         assert response.status_code == 404
 
 
@@ -169,7 +225,21 @@ class TestWebSocketConnection:
             data = websocket.receive_json()
             assert data["type"] == "pong"
             assert "timestamp" in data
-    
+
+    def test_websocket_binary_ping(self, client):
+        """Test ping/pong over binary msgpack frames."""
+        # Create session first
+        create_response = client.post("/api/sessions")
+        session_id = create_response.json()["session_id"]
+
+        with client.websocket_connect(f"/ws/{session_id}") as websocket:
+            # A binary frame switches the session to msgpack replies
+            websocket.send_bytes(msgpack.packb({"type": "ping"}))
+
+            data = msgpack.unpackb(websocket.receive_bytes(), raw=False)
+            assert data["type"] == "pong"
+            assert "timestamp" in data
+
     def test_websocket_chat_message_no_machine(self, client):
         """Test sending chat message without selected machine."""
         # Create session first
@@ -201,7 +271,12 @@ class TestDatabaseIntegration:
     
     def test_database_initialization(self):
         """Test database initialization."""
-        with tempfile.TemporaryDirectory() as temp_dir:
+        # Prefer tmpfs so the on-disk path is exercised at memory speed;
+        # /tmp is not tmpfs on many CI runners and /dev/shm does not
+        # exist on macOS, hence the fallback. tmpfs respects mode bits,
+        # so the chmod assertion below still holds.
+        shm = "/dev/shm" if os.path.isdir("/dev/shm") else None
+        with tempfile.TemporaryDirectory(dir=shm) as temp_dir:
             # Set database path to temp directory
             original_env = os.environ.get('DATABASE_DIR')
             os.environ['DATABASE_DIR'] = temp_dir
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""Validate that key project configuration and entry points are intact."""
+
+import io
+import mmap
+import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from verify_common import PROJECT_ROOT, read_source
+
+# First version-specifier operator on a requirements line; one scan
+# replaces chained str.split calls and also covers <, >, <=, != pins.
+_SPEC_RE = re.compile(r"[<>=~!]=?")
+
+
+def find_missing_markers(path, needles):
+    """Return the needles absent from a file using a zero-copy byte scan.
+
+    The file is mapped read-only instead of decoded into a str, so the
+    scan works directly against the page cache.
+    """
+    with open(PROJECT_ROOT / path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            return [needle for needle in needles if view.find(needle) == -1]
+
+
+def check_requirements():
+    """Check that core dependencies are declared exactly once."""
+    required = {"paramiko", "pydantic", "fastapi", "pytest", "cryptography"}
+    seen = set()
+    duplicates = set()
+
+    with open(PROJECT_ROOT / "requirements.txt") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            name = _SPEC_RE.split(line, maxsplit=1)[0].strip()
+            if name in seen:
+                duplicates.add(name)
+            seen.add(name)
+
+    missing = [package for package in sorted(required)
+               if not any(package in name for name in seen)]
+    if missing:
+        print(f"✗ requirements.txt is missing: {', '.join(missing)}")
+        return False
+    if duplicates:
+        print(f"✗ requirements.txt declares twice: {', '.join(sorted(duplicates))}")
+        return False
+
+    print("✓ requirements.txt declares core dependencies exactly once")
+    return True
+
+
+def check_health_endpoint():
+    """Check that the web application exposes the /health endpoint."""
+    # read_source caches the module text, so this check and the
+    # websocket one below share a single disk read of web_app.py.
+    content = read_source("src/web_app.py")
+    needles = ['@app.get("/health")', '"status": "healthy"']
+
+    if any(needle not in content for needle in needles):
+        print("✗ /health endpoint is missing from src/web_app.py")
+        return False
+
+    print("✓ /health endpoint present")
+    return True
+
+
+def check_websocket_endpoint():
+    """Check that the web application exposes the chat WebSocket endpoint."""
+    content = read_source("src/web_app.py")
+
+    if '@app.websocket("/ws/{session_id}")' not in content:
+        print("✗ WebSocket endpoint is missing from src/web_app.py")
+        return False
+
+    print("✓ WebSocket endpoint present")
+    return True
+
+
+def check_pytest_config():
+    """Check that pytest is configured with the expected markers."""
+    missing = find_missing_markers(
+        "pytest.ini", [b"unit:", b"integration:", b"performance:", b"slow:"]
+    )
+
+    if missing:
+        print(f"✗ pytest.ini is missing markers: {b', '.join(missing).decode()}")
+        return False
+
+    print("✓ pytest markers configured")
+    return True
+
+
+def check_docker_files():
+    """Check that the Docker build files are present and populated."""
+    if find_missing_markers("Dockerfile", [b"FROM python:"]) or \
+            find_missing_markers("docker-compose.yml", [b"services:"]):
+        print("✗ Docker build files are incomplete")
+        return False
+
+    print("✓ Docker build files present")
+    return True
+
+
+class _ThreadLocalStdout:
+    """Stdout proxy that routes each worker thread's prints to its own buffer.
+
+    The checks print their own results; running them concurrently through
+    plain sys.stdout would interleave lines, and redirect_stdout swaps the
+    stream process-wide. Writes from threads with no registered buffer
+    fall through to the real stream.
+    """
+
+    def __init__(self, fallback):
+        self._fallback = fallback
+        self._buffers = threading.local()
+
+    def capture(self, buffer):
+        self._buffers.current = buffer
+
+    def release(self):
+        buffer = self._buffers.current
+        del self._buffers.current
+        return buffer.getvalue()
+
+    def write(self, text):
+        getattr(self._buffers, 'current', self._fallback).write(text)
+
+    def flush(self):
+        getattr(self._buffers, 'current', self._fallback).flush()
+
+
+def main():
+    """Run all validation checks."""
+    print("Validating project fixes...\n")
+
+    checks = [
+        check_requirements,
+        check_health_endpoint,
+        check_websocket_endpoint,
+        check_pytest_config,
+        check_docker_files,
+    ]
+
+    proxy = _ThreadLocalStdout(sys.stdout)
+
+    def run_check(check):
+        proxy.capture(io.StringIO())
+        try:
+            ok = check()
+        except Exception as e:
+            print(f"✗ {check.__name__} crashed: {e}")
+            ok = False
+        return ok, proxy.release()
+
+    # Each check is I/O-bound on one small file, so the fan-out turns the
+    # total wall time into max(check) instead of sum(check).
+    original_stdout, sys.stdout = sys.stdout, proxy
+    try:
+        with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+            results = list(executor.map(run_check, checks))
+    finally:
+        sys.stdout = original_stdout
+
+    passed = 0
+    for ok, output in results:
+        sys.stdout.write(output)
+        if ok:
+            passed += 1
+
+    print(f"\n{passed}/{len(checks)} checks passed")
+    return passed == len(checks)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
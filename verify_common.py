@@ -0,0 +1,109 @@
+"""Shared helpers for the repository verification scripts.
+
+The verify_*/validate_* scripts all need to read and parse the same small
+set of project files.  Caching the source text and AST here means each file
+is read from disk and parsed at most once, no matter how many checks look
+at it.
+"""
+
+from __future__ import annotations
+
+import ast
+import json
+import os
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).parent
+
+# Syntax results persist across script invocations keyed by mtime/size,
+# so re-running the verify scripts skips files that have not changed.
+_SYNTAX_CACHE_PATH = PROJECT_ROOT / ".syntax_cache.json"
+_syntax_cache: Optional[Dict[str, str]] = None
+
+
+def _load_syntax_cache() -> Dict[str, str]:
+    global _syntax_cache
+    if _syntax_cache is None:
+        try:
+            _syntax_cache = json.loads(_SYNTAX_CACHE_PATH.read_text())
+        except (OSError, ValueError):
+            _syntax_cache = {}
+    return _syntax_cache
+
+
+def _save_syntax_cache() -> None:
+    if _syntax_cache is not None:
+        try:
+            _SYNTAX_CACHE_PATH.write_text(json.dumps(_syntax_cache))
+        except OSError:
+            pass
+
+
+@lru_cache(maxsize=None)
+def list_test_files() -> Tuple[str, ...]:
+    """Return every test module as a project-relative posix path.
+
+    The directory walk is memoized so that scripts running several
+    checks over the same listing only glob the tree once.
+    """
+    paths = sorted(PROJECT_ROOT.glob("test_*.py"))
+    paths.append(PROJECT_ROOT / "tests" / "conftest.py")
+    paths.extend(sorted((PROJECT_ROOT / "tests").rglob("test_*.py")))
+    return tuple(path.relative_to(PROJECT_ROOT).as_posix() for path in paths)
+
+
+@lru_cache(maxsize=None)
+def read_source(path: str) -> str:
+    """Read a source file once and cache the text for later checks."""
+    return (PROJECT_ROOT / path).read_text(encoding="utf-8")
+
+
+# Pinned once so the parser does not consult sys.version_info per call.
+_PY_VERSION = sys.version_info[:2]
+
+
+@lru_cache(maxsize=None)
+def parse_source(path: str) -> ast.AST:
+    """Parse a source file into an AST, cached for repeated checks.
+
+    The raw bytes go straight to ast.parse (no separate UTF-8 decode),
+    with type-comment tokenization off and the grammar version pinned.
+    """
+    source = (PROJECT_ROOT / path).read_bytes()
+    return ast.parse(
+        source, filename=path, type_comments=False, feature_version=_PY_VERSION
+    )
+
+
+def check_syntax(path: str) -> Tuple[bool, Optional[str]]:
+    """Return (ok, error message) for a single source file.
+
+    Unchanged files (same mtime and size as the last clean run) are
+    accepted from the on-disk cache without being re-read; everything
+    else goes through compile(), which validates syntax without
+    building the AST objects ast.parse would discard.
+    """
+    full_path = PROJECT_ROOT / path
+    try:
+        stat = os.stat(full_path)
+    except OSError as e:
+        return False, str(e)
+
+    stamp = f"{stat.st_mtime_ns}:{stat.st_size}"
+    cache = _load_syntax_cache()
+    if cache.get(path) == stamp:
+        return True, None
+
+    try:
+        compile(full_path.read_bytes(), str(full_path), "exec", dont_inherit=True)
+    except SyntaxError as e:
+        return False, f"line {e.lineno}: {e.msg}"
+    except (OSError, ValueError) as e:
+        return False, str(e)
+
+    cache[path] = stamp
+    _save_syntax_cache()
+    return True, None
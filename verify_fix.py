@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Verify that previously corrupted modules stay free of merge artifacts.
+
+Several files in this repository were damaged by duplicated merge blocks:
+repeated top-level definitions followed by syntactically broken leftovers.
+This script parses each affected module and checks that no definition
+appears more than once at the same scope.
+"""
+
+import ast
+import sys
+from collections import Counter
+
+from verify_common import check_syntax, parse_source
+
+# Modules that have previously contained duplicated merge blocks.
+WATCHED_FILES = [
+    "src/db_service.py",
+    "tests/conftest.py",
+    "tests/test_integration.py",
+    "tests/test_performance.py",
+]
+
+
+def find_duplicate_definitions(path):
+    """Return names defined more than once in the same scope."""
+    duplicates = []
+    tree = parse_source(path)
+    for node in ast.walk(tree):
+        if not isinstance(node, (ast.Module, ast.ClassDef)):
+            continue
+        names = Counter(
+            child.name for child in node.body
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))
+        )
+        duplicates.extend(name for name, count in names.items() if count > 1)
+    return duplicates
+
+
+def main():
+    """Check each watched module for syntax errors and duplicated blocks."""
+    print("Checking previously fixed modules...\n")
+
+    failed = 0
+    for path in WATCHED_FILES:
+        ok, error = check_syntax(path)
+        if not ok:
+            print(f"✗ {path}: {error}")
+            failed += 1
+            continue
+
+        duplicates = find_duplicate_definitions(path)
+        if duplicates:
+            print(f"✗ {path}: duplicated definitions: {', '.join(sorted(duplicates))}")
+            failed += 1
+        else:
+            print(f"✓ {path}")
+
+    print(f"\n{failed} module(s) still broken" if failed else "\nAll watched modules are clean")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
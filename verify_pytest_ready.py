@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Verify that the pytest suite is ready to run."""
+
+import sys
+
+from verify_common import PROJECT_ROOT, check_syntax, list_test_files, read_source
+
+
+def check_pytest_ini():
+    """Check that the pytest configuration file exists and is populated."""
+    if not (PROJECT_ROOT / "pytest.ini").exists():
+        print("✗ pytest.ini is missing")
+        return False
+
+    content = read_source("pytest.ini")
+    if "testpaths" not in content:
+        print("✗ pytest.ini does not configure testpaths")
+        return False
+
+    print("✓ pytest.ini present and configured")
+    return True
+
+
+def check_test_modules():
+    """Syntax-check every discovered test module, stopping at the first failure.
+
+    The shared listing picks up newly added files automatically, and
+    check_syntax's mtime cache makes the sweep near-free on unchanged
+    trees.
+    """
+    files = list_test_files()
+
+    for rel_path in files:
+        ok, error = check_syntax(rel_path)
+        if not ok:
+            print(f"✗ {rel_path}: {error}")
+            return False
+
+    print(f"✓ {len(files)} test module(s) parse cleanly")
+    return True
+
+
+def main():
+    """Run all readiness checks."""
+    print("Checking pytest readiness...\n")
+
+    checks = [check_pytest_ini, check_test_modules]
+    passed = sum(1 for check in checks if check())
+
+    print(f"\n{passed}/{len(checks)} readiness checks passed")
+    return passed == len(checks)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
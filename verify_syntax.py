@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""Verify that all test modules are free of syntax errors."""
+
+import concurrent.futures
+import sys
+
+from verify_common import check_syntax, list_test_files
+
+# Below this many files the process-pool startup costs more than the
+# parses it would spread across cores.
+_PARALLEL_THRESHOLD = 8
+
+
+def main():
+    """Syntax-check every test module and report the results."""
+    print("Checking test module syntax...\n")
+
+    rel_paths = list(list_test_files())
+
+    if len(rel_paths) < _PARALLEL_THRESHOLD:
+        results = [check_syntax(path) for path in rel_paths]
+    else:
+        # The files are independent and each parse holds the GIL, so the
+        # sweep fans out across cores instead of running serially.
+        with concurrent.futures.ProcessPoolExecutor() as executor:
+            results = list(executor.map(check_syntax, rel_paths))
+
+    failed = 0
+    for rel_path, (ok, error) in zip(rel_paths, results):
+        if ok:
+            print(f"✓ {rel_path}")
+        else:
+            print(f"✗ {rel_path}: {error}")
+            failed += 1
+
+    print(f"\n{failed} file(s) with syntax errors" if failed else "\nAll test modules parse cleanly")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)